@@ -16,19 +16,69 @@ Usage:
     python app.py /path/to/local/repo
 """
 
+import io
+import os
 import sys
 import json
+import logging
 import argparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from time import perf_counter, process_time
 from typing import Dict, List
 
-# Import core modules
-from core.repo_fetcher import RepoFetcher
-from core.dep_parser import DependencyParser
-from core.pathway_stream import PathwayStreamEngine
-from core.code_scanner import CodeScanner
-from core.impact_mapper import ImpactMapper
-from core.ai_fixer import AIFixer
+# Optional: faster JSON serialization for large reports
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger("depintel")
+
+# Horizontal rules for console banners
+_HR = "=" * 70
+_HR_THIN = "-" * 70
+
+
+def _relative_path(repo_prefix: str, file_path: str) -> str:
+    """
+    Express a file path relative to the repository root.
+    
+    Scanned file paths are built from the resolved repository path, so a
+    plain string prefix check is enough and avoids pathlib entirely.
+    
+    Args:
+        repo_prefix: Resolved repository path followed by a separator
+        file_path: Absolute file path
+        
+    Returns:
+        Relative path, or file_path unchanged if it lies outside the root
+    """
+    if file_path.startswith(repo_prefix):
+        return file_path[len(repo_prefix):]
+    return file_path
+
+
+@contextmanager
+def timed(step_name: str):
+    """
+    Log wall-clock and CPU time spent in a pipeline step.
+    
+    A large wall/CPU gap marks a step as I/O-bound (network, disk);
+    similar values mark it as CPU-bound.
+    
+    Args:
+        step_name: Short name of the step for the log line
+    """
+    wall_start = perf_counter()
+    cpu_start = process_time()
+    try:
+        yield
+    finally:
+        log.info("[TIMING] %s: wall=%.2fs cpu=%.2fs",
+                 step_name, perf_counter() - wall_start, process_time() - cpu_start)
 
 
 class DeprecationIntelligenceSystem:
@@ -36,19 +86,52 @@ class DeprecationIntelligenceSystem:
     Main orchestrator for the dependency deprecation intelligence system.
     """
     
-    def __init__(self, openai_api_key: str = None):
+    __slots__ = (
+        'repo_fetcher', 'dep_parser', 'pypi_metadata_cache', 'owns_pypi_cache', 'stream_engine',
+        'code_scanner', 'impact_mapper', 'ai_fixer', 'ai_workers',
+        'repo_path', 'dependencies', 'updates', 'usage_reports',
+        'impact_reports', 'ai_fixes'
+    )
+    
+    # Serial AI fix requests are network-bound, so packages are handled concurrently
+    AI_FIX_WORKERS = 8
+    
+    def __init__(self, openai_api_key: str = None, cache_path: str = None,
+                 ai_workers: int = AI_FIX_WORKERS, ai_batch: bool = False,
+                 ai_serial: bool = False, pypi_cache=None):
         """
         Initialize the system.
         
         Args:
             openai_api_key: Optional OpenAI API key for AI fixes
+            cache_path: Optional path to the PyPI metadata cache database
+            ai_workers: Maximum number of packages to send serial AI fix requests
+                for concurrently (batch and async requests are pooled across packages)
+            ai_batch: Generate AI fixes through the OpenAI Batch API
+            ai_serial: Send realtime AI fix requests one at a time per package
+            pypi_cache: Optional PyPICache shared between systems (e.g. by the
+                web server); by default the system opens its own at cache_path
+                and close() releases it
         """
+        # Core modules are imported here rather than at module load so that
+        # argument parsing (e.g. --help) doesn't pay for requests, packaging
+        # and the optional pathway/openai imports
+        from core.repo_fetcher import RepoFetcher
+        from core.dep_parser import DependencyParser
+        from core.pathway_stream import PathwayStreamEngine
+        from core.pypi_cache import PyPICache
+        from core.impact_mapper import ImpactMapper
+        from core.ai_fixer import AIFixer
+        
         self.repo_fetcher = RepoFetcher()
         self.dep_parser = DependencyParser()
-        self.stream_engine = PathwayStreamEngine()
+        self.owns_pypi_cache = pypi_cache is None
+        self.pypi_metadata_cache = PyPICache(cache_path) if pypi_cache is None else pypi_cache
+        self.stream_engine = PathwayStreamEngine(cache=self.pypi_metadata_cache)
         self.code_scanner = None  # Will be initialized after parsing deps
         self.impact_mapper = ImpactMapper()
-        self.ai_fixer = AIFixer(api_key=openai_api_key)
+        self.ai_fixer = AIFixer(api_key=openai_api_key, use_batch=ai_batch, serial=ai_serial)
+        self.ai_workers = max(1, ai_workers)
         
         self.repo_path = None
         self.dependencies = {}
@@ -67,65 +150,114 @@ class DeprecationIntelligenceSystem:
         Returns:
             Complete analysis results
         """
-        print("\n" + "=" * 70)
-        print("REAL-TIME DEPENDENCY DEPRECATION & MIGRATION INTELLIGENCE SYSTEM")
-        print("=" * 70)
+        log.info("\n" + _HR)
+        log.info("REAL-TIME DEPENDENCY DEPRECATION & MIGRATION INTELLIGENCE SYSTEM")
+        log.info(_HR)
         
         # Step 1: Fetch repository
-        print("\n[STEP 1/7] Fetching repository...")
-        success, repo_path, error = self.repo_fetcher.fetch(repo_input)
+        log.info("\n[STEP 1/7] Fetching repository...")
+        with timed("fetch"):
+            success, repo_path, error = self.repo_fetcher.fetch(repo_input)
         if not success:
-            print(f"[ERROR] Failed to fetch repository: {error}")
+            log.error("[ERROR] Failed to fetch repository: %s", error)
             return {'error': error}
         
+        # Resolve once; every scanned file path is derived from this root
+        repo_path = Path(repo_path).resolve()
         self.repo_path = repo_path
-        print(f"[OK] Repository ready at: {repo_path}")
+        log.info("[OK] Repository ready at: %s", repo_path)
         
         # Step 2: Parse dependencies
-        print("\n[STEP 2/7] Parsing dependencies...")
-        self.dependencies = self.dep_parser.parse_repository(repo_path)
+        log.info("\n[STEP 2/7] Parsing dependencies...")
+        with timed("parse"):
+            self.dependencies = self.dep_parser.parse_repository(repo_path)
         
         if not self.dependencies:
-            print("[WARNING] No dependencies found. Nothing to analyze.")
+            log.warning("[WARNING] No dependencies found. Nothing to analyze.")
             return {'error': 'No dependencies found'}
         
-        # Step 3: Stream PyPI updates
-        print("\n[STEP 3/7] Streaming PyPI updates...")
-        self.stream_engine.load_repo_dependencies(self.dependencies)
-        self.stream_engine.fetch_pypi_updates()
-        
-        # Step 4: Detect outdated and breaking changes
-        print("\n[STEP 4/7] Detecting outdated and breaking changes...")
-        self.updates = self.stream_engine.perform_streaming_join()
+        # Finding and stat'ing the Python files does not depend on PyPI data,
+        # so overlap it with the (network-bound) Steps 3-4; Step 5 then only
+        # parses the files that import a package with breaking changes
+        pipeline = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline")
+        listing_future = pipeline.submit(self._list_python_files, repo_path)
+        try:
+            # Step 3: Stream PyPI updates
+            log.info("\n[STEP 3/7] Streaming PyPI updates...")
+            with timed("pypi"):
+                self.stream_engine.load_repo_dependencies(self.dependencies)
+                self.stream_engine.fetch_pypi_updates()
+            
+            # Step 4: Detect outdated and breaking changes
+            log.info("\n[STEP 4/7] Detecting outdated and breaking changes...")
+            with timed("join"):
+                self.updates = self.stream_engine.perform_streaming_join()
+        finally:
+            # Don't hold up an early return (or an error) on the discovery
+            pipeline.shutdown(wait=False)
         
         breaking_updates = self.stream_engine.get_breaking_packages()
         outdated_updates = self.stream_engine.get_outdated_packages()
         
-        print(f"\n[SUMMARY] Found {len(breaking_updates)} breaking changes, {len(outdated_updates)} outdated packages")
+        log.info("\n[SUMMARY] Found %d breaking changes, %d outdated packages",
+                 len(breaking_updates), len(outdated_updates))
         
         if not breaking_updates:
-            print("[INFO] No breaking changes detected. Your dependencies are safe!")
+            log.info("[INFO] No breaking changes detected. Your dependencies are safe!")
+            listing_future.cancel()
             return self._generate_final_report()
         
         # Step 5: Scan code for package usage
-        print("\n[STEP 5/7] Scanning code for package usage...")
-        target_packages = {pkg.package_name for pkg in breaking_updates}
-        self.code_scanner = CodeScanner(target_packages)
-        self.usage_reports = self.code_scanner.scan_directory(repo_path)
+        log.info("\n[STEP 5/7] Scanning code for package usage...")
+        from core.code_scanner import CodeScanner
+        
+        self.code_scanner = CodeScanner(pkg.package_name for pkg in breaking_updates)
+        with timed("scan"):
+            self.usage_reports = self.code_scanner.scan_directory(
+                repo_path, listing=listing_future.result()
+            )
         
         # Step 6: Map breaking changes to impacted code
-        print("\n[STEP 6/7] Mapping breaking changes to impacted code...")
-        self.impact_reports = self.impact_mapper.map_impacts(breaking_updates, self.usage_reports)
+        log.info("\n[STEP 6/7] Mapping breaking changes to impacted code...")
+        with timed("map"):
+            self.impact_reports = self.impact_mapper.map_impacts(breaking_updates, self.usage_reports)
         
         # Step 7: Generate AI fixes
-        print("\n[STEP 7/7] Generating AI-powered migration fixes...")
-        for package_name, impact_report in self.impact_reports.items():
-            fixes = self.ai_fixer.generate_fixes_for_impact(impact_report)
-            self.ai_fixes.extend(fixes)
+        log.info("\n[STEP 7/7] Generating AI-powered migration fixes...")
+        with timed("ai_fix"):
+            if self.ai_fixer.overlaps_reports:
+                # One Batch API job, or one async request pool, covers every package
+                self.ai_fixes = self.ai_fixer.generate_fixes_for_impacts(list(self.impact_reports.values()))
+            else:
+                workers = max(1, min(self.ai_workers, len(self.impact_reports)))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for fixes in executor.map(self.ai_fixer.generate_fixes_for_impact, self.impact_reports.values()):
+                        self.ai_fixes.extend(fixes)
         
         # Generate final report
         return self._generate_final_report()
     
+    def close(self):
+        """Release the PyPI metadata cache if this system opened it."""
+        if self.owns_pypi_cache:
+            self.pypi_metadata_cache.close()
+    
+    def _list_python_files(self, repo_path: Path):
+        """
+        Find the repository's Python files (runs on the pipeline thread,
+        concurrently with the PyPI steps).
+        
+        Args:
+            repo_path: Repository root
+            
+        Returns:
+            PythonFileListing for the repository
+        """
+        from core.code_scanner import list_python_files
+        
+        with timed("discover"):
+            return list_python_files(repo_path)
+    
     def _generate_final_report(self) -> Dict:
         """
         Generate the final structured report.
@@ -133,14 +265,32 @@ class DeprecationIntelligenceSystem:
         Returns:
             Complete analysis report
         """
-        print("\n" + "=" * 70)
-        print("ANALYSIS COMPLETE")
-        print("=" * 70)
+        log.info("\n" + _HR)
+        log.info("ANALYSIS COMPLETE")
+        log.info(_HR)
         
         # Build structured output
         results = []
+        up_to_date = {}
+        breaking_count = 0
+        outdated_count = 0
+        
+        # Index AI fixes by location for constant-time lookup per file
+        fix_index = {(f.file_path, f.line_number): f for f in self.ai_fixes}
+        
+        repo_prefix = str(self.repo_path).rstrip(os.sep) + os.sep
         
         for update in self.updates:
+            # Up-to-date packages carry no impact data, so only record their version
+            if update.status == 'up-to-date':
+                up_to_date[update.package_name] = update.current_version
+                continue
+            
+            if update.status == 'breaking':
+                breaking_count += 1
+            elif update.status == 'outdated':
+                outdated_count += 1
+            
             package_result = {
                 'package': update.package_name,
                 'current_version': update.current_version,
@@ -154,37 +304,15 @@ class DeprecationIntelligenceSystem:
                 impact_report = self.impact_reports.get(update.package_name)
                 if impact_report:
                     # Group by file
-                    by_file = {}
+                    by_file = defaultdict(list)
                     for code in impact_report.impacted_code:
-                        if code.file_path not in by_file:
-                            by_file[code.file_path] = []
                         by_file[code.file_path].append(code)
                     
                     # Build file impact list
-                    for file_path, codes in by_file.items():
-                        file_impact = {
-                            'file': str(Path(file_path).relative_to(self.repo_path)),
-                            'impacts': [
-                                {
-                                    'line': code.line_number,
-                                    'api': code.api_element,
-                                    'context': code.context
-                                }
-                                for code in codes
-                            ]
-                        }
-                        
-                        # Add AI fix if available
-                        ai_fix = next((f for f in self.ai_fixes if f.file_path == file_path and f.line_number == codes[0].line_number), None)
-                        if ai_fix:
-                            file_impact['ai_fix'] = {
-                                'explanation': ai_fix.explanation,
-                                'fixed_code': ai_fix.fixed_code,
-                                'migration_notes': ai_fix.migration_notes,
-                                'confidence': ai_fix.confidence
-                            }
-                        
-                        package_result['impacted_files'].append(file_impact)
+                    package_result['impacted_files'] = [
+                        self._build_file_impact(file_path, codes, fix_index, repo_prefix)
+                        for file_path, codes in by_file.items()
+                    ]
             
             results.append(package_result)
         
@@ -192,11 +320,49 @@ class DeprecationIntelligenceSystem:
             'repository': str(self.repo_path),
             'total_dependencies': len(self.dependencies),
             'total_updates': len(self.updates),
-            'breaking_changes': len(self.stream_engine.get_breaking_packages()),
-            'outdated_packages': len(self.stream_engine.get_outdated_packages()),
-            'results': results
+            'breaking_changes': breaking_count,
+            'outdated_packages': outdated_count,
+            'results': results,
+            'up_to_date': up_to_date
         }
     
+    def _build_file_impact(self, file_path: str, codes: List, fix_index: Dict, repo_prefix: str) -> Dict:
+        """
+        Build the report entry for one impacted file.
+        
+        Args:
+            file_path: Absolute path of the impacted file
+            codes: ImpactedCode objects in this file
+            fix_index: AI fixes keyed by (file_path, line_number)
+            repo_prefix: Resolved repository path followed by a separator
+            
+        Returns:
+            File impact dictionary
+        """
+        file_impact = {
+            'file': _relative_path(repo_prefix, file_path),
+            'impacts': [
+                {
+                    'line': code.line_number,
+                    'api': code.api_element,
+                    'context': code.context
+                }
+                for code in codes
+            ]
+        }
+        
+        # Add AI fix if available
+        ai_fix = fix_index.get((file_path, codes[0].line_number))
+        if ai_fix:
+            file_impact['ai_fix'] = {
+                'explanation': ai_fix.explanation,
+                'fixed_code': ai_fix.fixed_code,
+                'migration_notes': ai_fix.migration_notes,
+                'confidence': ai_fix.confidence
+            }
+        
+        return file_impact
+    
     def print_report(self, report: Dict):
         """
         Print a human-readable report.
@@ -204,43 +370,63 @@ class DeprecationIntelligenceSystem:
         Args:
             report: Report dictionary
         """
-        print("\n" + "=" * 70)
-        print("FINAL REPORT")
-        print("=" * 70)
+        sys.stdout.write(self._render_report(report))
+    
+    def _render_report(self, report: Dict) -> str:
+        """
+        Render the human-readable report into a single string, so it is
+        written to stdout in one call rather than line by line.
         
-        print(f"\nRepository: {report['repository']}")
-        print(f"Total dependencies: {report['total_dependencies']}")
-        print(f"Total updates available: {report['total_updates']}")
-        print(f"Breaking changes: {report['breaking_changes']}")
-        print(f"Outdated packages: {report['outdated_packages']}")
+        Args:
+            report: Report dictionary
+            
+        Returns:
+            Formatted report text
+        """
+        buf = io.StringIO()
         
-        print("\n" + "-" * 70)
-        print("PACKAGE DETAILS")
-        print("-" * 70)
+        print("\n" + _HR, file=buf)
+        print("FINAL REPORT", file=buf)
+        print(_HR, file=buf)
+        
+        print(f"\nRepository: {report['repository']}", file=buf)
+        print(f"Total dependencies: {report['total_dependencies']}", file=buf)
+        print(f"Total updates available: {report['total_updates']}", file=buf)
+        print(f"Breaking changes: {report['breaking_changes']}", file=buf)
+        print(f"Outdated packages: {report['outdated_packages']}", file=buf)
+        
+        print("\n" + _HR_THIN, file=buf)
+        print("PACKAGE DETAILS", file=buf)
+        print(_HR_THIN, file=buf)
         
         for result in report['results']:
-            print(f"\n{result['package']}:")
-            print(f"  Current: {result['current_version']}")
-            print(f"  Latest: {result['latest_version']}")
-            print(f"  Status: {result['status'].upper()}")
+            print(f"\n{result['package']}:", file=buf)
+            print(f"  Current: {result['current_version']}", file=buf)
+            print(f"  Latest: {result['latest_version']}", file=buf)
+            print(f"  Status: {result['status'].upper()}", file=buf)
             
             if result['impacted_files']:
-                print(f"  Impacted files: {len(result['impacted_files'])}")
+                print(f"  Impacted files: {len(result['impacted_files'])}", file=buf)
                 for file_impact in result['impacted_files']:
-                    print(f"\n    File: {file_impact['file']}")
+                    print(f"\n    File: {file_impact['file']}", file=buf)
                     for impact in file_impact['impacts']:
-                        print(f"      Line {impact['line']}: {impact['api']}")
-                        print(f"        {impact['context']}")
+                        print(f"      Line {impact['line']}: {impact['api']}", file=buf)
+                        print(f"        {impact['context']}", file=buf)
                     
                     if 'ai_fix' in file_impact:
                         fix = file_impact['ai_fix']
-                        print(f"\n      AI Fix (confidence: {fix['confidence']:.2f}):")
-                        print(f"        Explanation: {fix['explanation']}")
-                        print(f"        Fixed code: {fix['fixed_code']}")
+                        print(f"\n      AI Fix (confidence: {fix['confidence']:.2f}):", file=buf)
+                        print(f"        Explanation: {fix['explanation']}", file=buf)
+                        print(f"        Fixed code: {fix['fixed_code']}", file=buf)
                         if fix['migration_notes']:
-                            print(f"        Notes: {fix['migration_notes'][:100]}...")
+                            print(f"        Notes: {fix['migration_notes'][:100]}...", file=buf)
+        
+        if report.get('up_to_date'):
+            print(f"\nUp-to-date: {', '.join(sorted(report['up_to_date']))}", file=buf)
         
-        print("\n" + "=" * 70)
+        print("\n" + _HR, file=buf)
+        
+        return buf.getvalue()
     
     def save_report(self, report: Dict, output_file: str = "migration_report.json"):
         """
@@ -250,9 +436,18 @@ class DeprecationIntelligenceSystem:
             report: Report dictionary
             output_file: Output file path
         """
-        with open(output_file, 'w') as f:
-            json.dump(report, f, indent=2)
-        print(f"\n[OK] Report saved to: {output_file}")
+        # default=str lets non-JSON values (e.g. Path) through on both encoders
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(
+                    report,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                    default=str
+                ))
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(report, f, indent=2, default=str)
+        log.info("\n[OK] Report saved to: %s", output_file)
 
 
 def main():
@@ -276,19 +471,65 @@ def main():
         '--openai-key',
         help='OpenAI API key for AI-powered fixes (or set OPENAI_API_KEY env var)'
     )
+    parser.add_argument(
+        '--ai-workers',
+        type=int,
+        default=DeprecationIntelligenceSystem.AI_FIX_WORKERS,
+        help='Packages to send --serial AI fix requests for concurrently '
+             f'(default: {DeprecationIntelligenceSystem.AI_FIX_WORKERS}; lower this if rate-limited)'
+    )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Generate AI fixes with the OpenAI Batch API as one job (half the cost; '
+             'falls back to realtime requests if the job takes over an hour)'
+    )
+    parser.add_argument(
+        '--serial',
+        action='store_true',
+        help='Send realtime AI fix requests one at a time per package '
+             '(default: overlap them with the async OpenAI client)'
+    )
+    parser.add_argument(
+        '--quiet',
+        '-q',
+        action='store_true',
+        help='Only log warnings and errors while the analysis runs'
+    )
+    parser.add_argument(
+        '--cache-path',
+        help='PyPI metadata cache database (default: ~/.cache/depintel/pypi.sqlite)'
+    )
     
     args = parser.parse_args()
     
+    # Progress from every module goes through the "depintel" logger to
+    # stderr, so stdout carries only the final report
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(message)s",
+        stream=sys.stderr
+    )
+    
     # Initialize and run system
-    system = DeprecationIntelligenceSystem(openai_api_key=args.openai_key)
-    report = system.run(args.repo)
+    system = DeprecationIntelligenceSystem(
+        openai_api_key=args.openai_key,
+        cache_path=args.cache_path,
+        ai_workers=args.ai_workers,
+        ai_batch=args.batch,
+        ai_serial=args.serial
+    )
+    try:
+        report = system.run(args.repo)
+    finally:
+        system.close()
     
     # Print report
     if 'error' not in report:
         system.print_report(report)
         system.save_report(report, args.output)
     else:
-        print(f"\n[ERROR] {report['error']}")
+        log.error("\n[ERROR] %s", report['error'])
         sys.exit(1)
 
 
@@ -0,0 +1,36 @@
+"""
+Compatibility helpers shared by the core modules.
+"""
+
+import sys
+
+# Optional: faster JSON parsing and serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+# Scans and parses create many small records (usages, dependencies, fixes),
+# so drop the per-instance __dict__ where dataclasses support it (Python 3.10+)
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+if orjson is not None:
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+else:
+    json_loads = json.loads
+    
+    def json_dumps(obj) -> bytes:
+        """
+        Serialize an object to UTF-8 JSON bytes, as orjson.dumps does.
+        
+        Args:
+            obj: JSON-serializable object
+            
+        Returns:
+            Encoded JSON document
+        """
+        return json.dumps(obj).encode('utf-8')
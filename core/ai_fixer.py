@@ -7,13 +7,34 @@ Uses RAG (Retrieval-Augmented Generation) + LLM to:
 - Cite migration logic from official documentation
 """
 
+import asyncio
+import hashlib
+import logging
 import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import json
 
+try:
+    from ._compat import DATACLASS_SLOTS, json_dumps, json_loads
+except ImportError:  # run directly as a script (python core/ai_fixer.py)
+    from _compat import DATACLASS_SLOTS, json_dumps, json_loads
 
-@dataclass
+log = logging.getLogger("depintel")
+
+DEFAULT_FIX_CACHE_PATH = Path.home() / ".cache" / "depintel" / "fixes.json"
+
+# Body of the first markdown code fence (optionally tagged ```json) in an LLM response
+_FENCE_RE = re.compile(r"```(?:json)?(.*?)```", re.S)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class AIFix:
     """
     Represents an AI-generated fix for a breaking change.
@@ -53,29 +74,77 @@ class AIFixer:
     - Cites official documentation
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4"):
+    # Retry policy for rate-limited (HTTP 429) LLM requests
+    MAX_RETRIES = 4
+    RETRY_BASE_DELAY = 1.0
+    
+    # Batch API settings (completion window, status polling interval, and
+    # how long to wait for a job before falling back to realtime requests)
+    BATCH_COMPLETION_WINDOW = "24h"
+    BATCH_POLL_INTERVAL = 30.0
+    BATCH_MAX_WAIT = 3600.0
+    BATCH_TERMINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
+    
+    # Realtime requests kept in flight at once by the async client (across
+    # all reports passed to generate_fixes_for_impacts)
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    # Sites of the same package/version change sent in a single prompt,
+    # and the completion token budget per site
+    MAX_SITES_PER_PROMPT = 5
+    MAX_TOKENS_PER_FIX = 1000
+    
+    # Part of every fix cache key; bump it whenever the prompts or the
+    # expected response format change, so older answers are not reused
+    PROMPT_VERSION = 1
+    
+    # Responses kept in the fix cache (oldest dropped first)
+    FIX_CACHE_SIZE = 10_000
+    
+    SYSTEM_PROMPT = "You are a Python migration expert. Analyze breaking changes and provide accurate migration guidance. Never hallucinate fixes. Use official documentation when available."
+    
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4", use_batch: bool = False,
+                 serial: bool = False, fix_cache_path: Optional[str] = None):
         """
         Initialize the AI fixer.
         
         Args:
             api_key: OpenAI API key (or None to use environment variable)
             model: Model to use (default: gpt-4)
+            use_batch: Submit fixes through the OpenAI Batch API instead of
+                one realtime request per impacted site
+            serial: Send realtime requests one at a time instead of
+                overlapping them with the async client
+            fix_cache_path: Path to the persisted LLM response cache
+                (default: ~/.cache/depintel/fixes.json)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model = model
+        self.use_batch = use_batch
+        self.serial = serial
+        self.async_client_class = None
         self.llm_available = False
         
+        # LLM responses keyed by _fix_cache_key, shared across runs
+        self.fix_cache_path = Path(fix_cache_path) if fix_cache_path else DEFAULT_FIX_CACHE_PATH
+        self._fix_cache: Dict[str, str] = {}
+        self._fix_cache_lock = threading.Lock()
+        
         # Check if OpenAI is available
         try:
             import openai
             if self.api_key:
                 self.client = openai.OpenAI(api_key=self.api_key)
+                # The async client is opened per event loop (one per
+                # generate_fixes_for_impact(s) call), so only keep the class
+                self.async_client_class = openai.AsyncOpenAI
                 self.llm_available = True
-                print("[OK] OpenAI client initialized")
+                self._fix_cache = self._load_fix_cache()
+                log.info("[OK] OpenAI client initialized")
             else:
-                print("[WARNING] No OpenAI API key found. AI fixes will use fallback logic.")
+                log.warning("[WARNING] No OpenAI API key found. AI fixes will use fallback logic.")
         except ImportError:
-            print("[WARNING] OpenAI library not installed. AI fixes will use fallback logic.")
+            log.warning("[WARNING] OpenAI library not installed. AI fixes will use fallback logic.")
     
     def generate_fix(self, impacted_code) -> AIFix:
         """
@@ -94,7 +163,8 @@ class AIFixer:
     
     def _generate_llm_fix(self, impacted_code) -> AIFix:
         """
-        Generate fix using LLM.
+        Generate fix using LLM, reusing a cached response for an identical
+        site when one exists.
         
         Args:
             impacted_code: ImpactedCode object
@@ -102,34 +172,194 @@ class AIFixer:
         Returns:
             AIFix object
         """
-        # Construct prompt
-        prompt = self._build_prompt(impacted_code)
+        key = self._fix_cache_key(impacted_code)
+        content = self._fix_cache.get(key)
+        
+        if content is None:
+            content = self._request_chunk([(key, impacted_code)]).get(key)
+            if content is None:
+                return self._generate_fallback_fix(impacted_code)
+            self._store_fix_contents({key: content})
+        
+        return self._parse_llm_response(impacted_code, content)
+    
+    def _request_chunk(self, chunk: List[Tuple[str, object]]) -> Dict[str, str]:
+        """
+        Request fixes for a chunk of sites (see _chunk_pending) with one
+        LLM call.
         
+        Args:
+            chunk: List of (fix cache key, ImpactedCode) pairs
+            
+        Returns:
+            Dict mapping fix cache keys to response content (missing on failure)
+        """
         try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a Python migration expert. Analyze breaking changes and provide accurate migration guidance. Never hallucinate fixes. Use official documentation when available."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,  # Lower temperature for more deterministic output
-                max_tokens=1000
+            response = self._create_completion_with_backoff(self._build_chunk_prompt(chunk), sites=len(chunk))
+            return self._split_chunk_content(chunk, response.choices[0].message.content)
+        except Exception as e:
+            log.warning("[WARNING] LLM generation failed: %s", e)
+            return {}
+    
+    async def _arequest_chunk(self, client, chunk: List[Tuple[str, object]]) -> Dict[str, str]:
+        """
+        Request fixes for a chunk of sites without blocking the event loop.
+        
+        Args:
+            client: AsyncOpenAI client
+            chunk: List of (fix cache key, ImpactedCode) pairs
+            
+        Returns:
+            Dict mapping fix cache keys to response content (missing on failure)
+        """
+        try:
+            response = await self._acreate_completion_with_backoff(
+                client, self._build_chunk_prompt(chunk), sites=len(chunk)
             )
+            return self._split_chunk_content(chunk, response.choices[0].message.content)
+        except Exception as e:
+            log.warning("[WARNING] LLM generation failed: %s", e)
+            return {}
+    
+    def _request_fix_contents_serial(self, pending: Dict) -> Dict[str, str]:
+        """
+        Request fixes for several impacted sites one chunk at a time.
+        
+        Args:
+            pending: Dict mapping fix cache keys to ImpactedCode objects
             
-            # Parse response
-            content = response.choices[0].message.content
-            return self._parse_llm_response(impacted_code, content)
+        Returns:
+            Dict mapping fix cache keys to response content (missing on failure)
+        """
+        contents = {}
+        for chunk in self._chunk_pending(pending):
+            contents.update(self._request_chunk(chunk))
+        return contents
+    
+    def _request_fix_contents_async(self, pending: Dict) -> Dict[str, str]:
+        """
+        Request fixes for several impacted sites concurrently on a fresh
+        event loop.
+        
+        Args:
+            pending: Dict mapping fix cache keys to ImpactedCode objects
             
-        except Exception as e:
-            print(f"[WARNING] LLM generation failed: {e}")
-            return self._generate_fallback_fix(impacted_code)
+        Returns:
+            Dict mapping fix cache keys to response content (missing on failure)
+        """
+        return asyncio.run(self._arequest_fix_contents(pending))
+    
+    async def _arequest_fix_contents(self, pending: Dict) -> Dict[str, str]:
+        """
+        Request fixes for several impacted sites concurrently, keeping at
+        most MAX_CONCURRENT_REQUESTS requests in flight.
+        
+        Args:
+            pending: Dict mapping fix cache keys to ImpactedCode objects
+            
+        Returns:
+            Dict mapping fix cache keys to response content (missing on failure)
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        
+        async with self.async_client_class(api_key=self.api_key) as client:
+            async def bounded(chunk):
+                async with semaphore:
+                    return await self._arequest_chunk(client, chunk)
+            
+            results = await asyncio.gather(*(bounded(chunk) for chunk in self._chunk_pending(pending)))
+        
+        contents = {}
+        for result in results:
+            contents.update(result)
+        return contents
+    
+    def _create_completion_with_backoff(self, prompt: str, sites: int = 1):
+        """
+        Call the chat completions API, retrying rate-limited requests
+        with exponential backoff.
+        
+        Args:
+            prompt: User prompt
+            sites: Number of sites the prompt asks fixes for
+            
+        Returns:
+            Chat completion response
+        """
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                return self.client.chat.completions.create(**self._build_request_body(prompt, sites))
+            except Exception as e:
+                if not self._is_retryable(e) or attempt == self.MAX_RETRIES:
+                    raise
+                delay = self.RETRY_BASE_DELAY * (2 ** attempt)
+                log.warning("[WARNING] LLM API returned %s, retrying in %.0fs...", e.status_code, delay)
+                time.sleep(delay)
+    
+    async def _acreate_completion_with_backoff(self, client, prompt: str, sites: int = 1):
+        """
+        Async counterpart of _create_completion_with_backoff.
+        
+        Args:
+            client: AsyncOpenAI client
+            prompt: User prompt
+            sites: Number of sites the prompt asks fixes for
+            
+        Returns:
+            Chat completion response
+        """
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                return await client.chat.completions.create(**self._build_request_body(prompt, sites))
+            except Exception as e:
+                if not self._is_retryable(e) or attempt == self.MAX_RETRIES:
+                    raise
+                delay = self.RETRY_BASE_DELAY * (2 ** attempt)
+                log.warning("[WARNING] LLM API returned %s, retrying in %.0fs...", e.status_code, delay)
+                await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """
+        Check whether an LLM API error is worth retrying (rate limit or
+        server-side failure).
+        
+        Args:
+            error: Exception raised by the OpenAI client
+            
+        Returns:
+            True if the request should be retried
+        """
+        status = getattr(error, 'status_code', None)
+        return status is not None and (status == 429 or status >= 500)
+    
+    def _build_request_body(self, prompt: str, sites: int = 1) -> Dict:
+        """
+        Build the chat completions request body for a prompt.
+        
+        Args:
+            prompt: User prompt
+            sites: Number of sites the prompt asks fixes for (scales the
+                completion token budget)
+            
+        Returns:
+            Request body (shared by realtime and batch requests)
+        """
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3,  # Lower temperature for more deterministic output
+            "max_tokens": self.MAX_TOKENS_PER_FIX * sites
+        }
     
     def _build_prompt(self, impacted_code) -> str:
         """
@@ -168,6 +398,139 @@ Format your response as JSON:
 }}
 """
     
+    def _build_batched_prompt(self, sites: List) -> str:
+        """
+        Build one LLM prompt covering several sites of the same package
+        and version change.
+        
+        Args:
+            sites: ImpactedCode objects sharing package_name, current_version
+                and latest_version
+            
+        Returns:
+            Prompt string asking for a JSON array of fixes keyed by site id
+        """
+        first = sites[0]
+        site_list = json.dumps([
+            {
+                "id": i,
+                "file": ic.file_path,
+                "line": ic.line_number,
+                "code": ic.context,
+                "api": ic.api_element,
+                "usage_type": ic.usage_type
+            }
+            for i, ic in enumerate(sites)
+        ], indent=2)
+        
+        return f"""Analyze this breaking change and provide migration guidance for each affected site:
+
+Package: {first.package_name}
+Current Version: {first.current_version}
+Latest Version: {first.latest_version}
+
+Affected Code:
+{site_list}
+
+For each site, please provide:
+1. EXPLANATION: Brief explanation of what changed and why it's breaking
+2. FIXED_CODE: The corrected code snippet
+3. MIGRATION_NOTES: Any additional migration steps or considerations
+
+Format your response as a JSON array with one object per site:
+[
+    {{
+        "id": <site id>,
+        "explanation": "...",
+        "fixed_code": "...",
+        "migration_notes": "...",
+        "confidence": 0.0-1.0
+    }}
+]
+"""
+    
+    def _chunk_pending(self, pending: Dict) -> List[List[Tuple[str, object]]]:
+        """
+        Group sites awaiting a fix by package and version change, in chunks
+        of at most MAX_SITES_PER_PROMPT, so each chunk can share one prompt.
+        
+        Args:
+            pending: Dict mapping fix cache keys to ImpactedCode objects
+            
+        Returns:
+            List of chunks of (fix cache key, ImpactedCode) pairs
+        """
+        groups: Dict[Tuple[str, str, str], List[Tuple[str, object]]] = {}
+        for key, ic in pending.items():
+            groups.setdefault((ic.package_name, ic.current_version, ic.latest_version), []).append((key, ic))
+        
+        size = self.MAX_SITES_PER_PROMPT
+        return [group[i:i + size] for group in groups.values() for i in range(0, len(group), size)]
+    
+    def _build_chunk_prompt(self, chunk: List[Tuple[str, object]]) -> str:
+        """
+        Build the prompt for a chunk of sites.
+        
+        Args:
+            chunk: List of (fix cache key, ImpactedCode) pairs
+            
+        Returns:
+            Single-site prompt for one site, batched prompt otherwise
+        """
+        if len(chunk) == 1:
+            return self._build_prompt(chunk[0][1])
+        return self._build_batched_prompt([ic for _, ic in chunk])
+    
+    def _split_chunk_content(self, chunk: List[Tuple[str, object]], content: str) -> Dict[str, str]:
+        """
+        Split the response to a chunk prompt into per-site response content.
+        
+        Every fix is checked and re-serialized on its own, so only well-formed
+        fixes reach the fix cache, and the cache and _parse_llm_response see
+        the same single-fix JSON object whatever the prompt.
+        
+        Args:
+            chunk: List of (fix cache key, ImpactedCode) pairs
+            content: LLM response content
+            
+        Returns:
+            Dict mapping fix cache keys to response content; sites missing
+            from the response, or whose fix has no fixed_code, are left out
+            
+        Raises:
+            ValueError: If the response is not the expected JSON
+        """
+        fence = _FENCE_RE.search(content)
+        data = json_loads(fence.group(1).strip() if fence else content)
+        
+        if len(chunk) == 1:
+            if not self._is_fix(data):
+                raise ValueError("expected a JSON object with fixed_code")
+            return {chunk[0][0]: json.dumps(data)}
+        
+        if not isinstance(data, list):
+            raise ValueError("expected a JSON array of fixes")
+        
+        contents = {}
+        for item in data:
+            site_id = item.get("id") if self._is_fix(item) else None
+            if isinstance(site_id, int) and 0 <= site_id < len(chunk):
+                contents[chunk[site_id][0]] = json.dumps(item)
+        return contents
+    
+    @staticmethod
+    def _is_fix(data) -> bool:
+        """
+        Check whether parsed response content is a usable fix.
+        
+        Args:
+            data: Parsed JSON value
+            
+        Returns:
+            True if it is an object with a fixed_code field
+        """
+        return isinstance(data, dict) and isinstance(data.get("fixed_code"), str)
+    
     def _parse_llm_response(self, impacted_code, content: str) -> AIFix:
         """
         Parse LLM response into AIFix object.
@@ -182,16 +545,11 @@ Format your response as JSON:
         try:
             # Try to parse as JSON
             # Extract JSON from markdown code blocks if present
-            if "```json" in content:
-                start = content.find("```json") + 7
-                end = content.find("```", start)
-                content = content[start:end].strip()
-            elif "```" in content:
-                start = content.find("```") + 3
-                end = content.find("```", start)
-                content = content[start:end].strip()
+            fence = _FENCE_RE.search(content)
+            if fence:
+                content = fence.group(1).strip()
             
-            data = json.loads(content)
+            data = json_loads(content)
             
             return AIFix(
                 package_name=impacted_code.package_name,
@@ -206,7 +564,7 @@ Format your response as JSON:
                 confidence=float(data.get('confidence', 0.5))
             )
         except Exception as e:
-            print(f"[WARNING] Failed to parse LLM response: {e}")
+            log.warning("[WARNING] Failed to parse LLM response: %s", e)
             return self._generate_fallback_fix(impacted_code)
     
     def _generate_fallback_fix(self, impacted_code) -> AIFix:
@@ -254,17 +612,295 @@ Common migration steps:
         Returns:
             List of AIFix objects
         """
-        print(f"[INFO] Generating AI fixes for {impact_report.package_name}...")
-        fixes = []
+        if self.use_batch and self.llm_available:
+            return self.generate_fixes_batch(impact_report)
         
-        for impacted_code in impact_report.impacted_code:
-            fix = self.generate_fix(impacted_code)
-            fixes.append(fix)
-            print(f"  - {impacted_code.file_path}:{impacted_code.line_number} (confidence: {fix.confidence:.2f})")
+        log.info("[INFO] Generating AI fixes for %s...", impact_report.package_name)
+        return self._generate_fixes([impact_report], self._realtime_fetch())
+    
+    @property
+    def overlaps_reports(self) -> bool:
+        """
+        Whether generate_fixes_for_impacts already overlaps the requests
+        for all its reports (Batch API job or async client), so callers
+        should pass every report at once rather than add threads.
+        """
+        return self.llm_available and (
+            self.use_batch or (self.async_client_class is not None and not self.serial)
+        )
+    
+    def generate_fixes_for_impacts(self, impact_reports: List) -> List[AIFix]:
+        """
+        Generate fixes for the impacted code of several impact reports,
+        requesting the sites of all of them together (one Batch API job in
+        batch mode; one event loop and client, with at most
+        MAX_CONCURRENT_REQUESTS requests in flight, with the async client).
         
-        print(f"[OK] Generated {len(fixes)} fixes")
+        Args:
+            impact_reports: BreakingChangeImpact objects
+            
+        Returns:
+            List of AIFix objects (report by report, in impacted_code order)
+        """
+        names = ", ".join(report.package_name for report in impact_reports)
+        if self.use_batch and self.llm_available:
+            log.info("[INFO] Submitting batch of AI fixes for %s...", names)
+            return self._generate_fixes(impact_reports, self._request_fix_contents_batch)
+        
+        log.info("[INFO] Generating AI fixes for %s...", names)
+        return self._generate_fixes(impact_reports, self._realtime_fetch())
+    
+    def generate_fixes_batch(self, impact_report) -> List[AIFix]:
+        """
+        Generate fixes for all impacted code in an impact report with a
+        single OpenAI Batch API job.
+        
+        Uncached sites are grouped into chunks (see _chunk_pending) and
+        every chunk becomes one line of a JSONL input file keyed by a
+        custom_id; the job is polled until it finishes and its output is
+        matched back to the sites. If the job has not finished within
+        BATCH_MAX_WAIT, or fails, the sites are requested in realtime
+        instead. Sites without a usable result get the fallback fix.
+        
+        Args:
+            impact_report: BreakingChangeImpact object
+            
+        Returns:
+            List of AIFix objects (in impacted_code order)
+        """
+        log.info("[INFO] Submitting batch of AI fixes for %s...", impact_report.package_name)
+        return self._generate_fixes([impact_report], self._request_fix_contents_batch)
+    
+    def _realtime_fetch(self):
+        """
+        Pick how uncached sites are requested outside batch mode.
+        
+        Returns:
+            Fetch callable for _generate_fixes, or None when no LLM is available
+        """
+        if not self.llm_available:
+            return None
+        if self.async_client_class is not None and not self.serial:
+            return self._request_fix_contents_async
+        return self._request_fix_contents_serial
+    
+    def _generate_fixes(self, impact_reports: List, fetch) -> List[AIFix]:
+        """
+        Generate fixes for impact reports, requesting each distinct site
+        (see _fix_cache_key) from the LLM at most once across all of them.
+        
+        Args:
+            impact_reports: BreakingChangeImpact objects
+            fetch: Callable taking a dict of fix cache keys to ImpactedCode
+                objects and returning a dict of keys to response content,
+                or None to use fallback fixes
+            
+        Returns:
+            List of AIFix objects (report by report, in impacted_code order)
+        """
+        report_keys = []
+        requested = []
+        pending = {}
+        for report in impact_reports:
+            keys = [self._fix_cache_key(ic) for ic in report.impacted_code] if fetch else []
+            before = len(pending)
+            for key, impacted_code in zip(keys, report.impacted_code):
+                if key not in self._fix_cache and key not in pending:
+                    pending[key] = impacted_code
+            report_keys.append(keys)
+            requested.append(len(pending) - before)
+        
+        contents = {}
+        if pending:
+            try:
+                contents = {key: content for key, content in fetch(pending).items() if content is not None}
+            except Exception as e:
+                log.warning("[WARNING] LLM generation failed: %s", e)
+            self._store_fix_contents(contents)
+        
+        fixes = []
+        for report, keys, report_requested in zip(impact_reports, report_keys, requested):
+            impacted = report.impacted_code
+            for i, impacted_code in enumerate(impacted):
+                # Fresh responses first: the cache may already have evicted them
+                content = contents.get(keys[i], self._fix_cache.get(keys[i])) if fetch else None
+                if content is None:
+                    fix = self._generate_fallback_fix(impacted_code)
+                else:
+                    fix = self._parse_llm_response(impacted_code, content)
+                fixes.append(fix)
+                log.info("  - %s:%s (confidence: %.2f)", impacted_code.file_path, impacted_code.line_number, fix.confidence)
+            
+            reused = len(impacted) - report_requested if fetch else 0
+            if reused:
+                log.info("[OK] Generated %s fixes for %s (%s reused from cache)", len(impacted), report.package_name, reused)
+            else:
+                log.info("[OK] Generated %s fixes for %s", len(impacted), report.package_name)
         return fixes
     
+    def _fix_cache_key(self, impacted_code) -> str:
+        """
+        Build the fix cache key for an impacted site. Sites with the same
+        package, version pair, API element and source line get the same fix
+        (for the same model and PROMPT_VERSION).
+        
+        Args:
+            impacted_code: ImpactedCode object
+            
+        Returns:
+            Hex digest identifying the site's prompt
+        """
+        raw = "|".join((
+            str(self.PROMPT_VERSION),
+            self.model,
+            impacted_code.package_name,
+            impacted_code.current_version,
+            impacted_code.latest_version,
+            impacted_code.api_element,
+            impacted_code.context,
+        ))
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _load_fix_cache(self) -> Dict[str, str]:
+        """
+        Load LLM responses persisted by previous runs.
+        
+        Returns:
+            Dict mapping fix cache keys to response content (empty if the
+            file is missing or malformed)
+        """
+        try:
+            with open(self.fix_cache_path, "rb") as f:
+                cache = json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+        return {key: content for key, content in cache.items() if isinstance(content, str)}
+    
+    def _store_fix_contents(self, contents: Dict[str, str]) -> None:
+        """
+        Add LLM responses to the fix cache and persist it, dropping the
+        oldest responses beyond FIX_CACHE_SIZE.
+        
+        Called once per _generate_fixes (or generate_fix) call with all the
+        responses it received, so the file is written once per call.
+        
+        Args:
+            contents: Dict mapping fix cache keys to response content
+        """
+        if not contents:
+            return
+        with self._fix_cache_lock:
+            fix_cache = self._fix_cache
+            for key, content in contents.items():
+                # Re-insert so the newest responses are evicted last
+                fix_cache.pop(key, None)
+                fix_cache[key] = content
+            while len(fix_cache) > self.FIX_CACHE_SIZE:
+                fix_cache.pop(next(iter(fix_cache)))
+            
+            try:
+                self.fix_cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # A unique temp file, so concurrent processes (CLI and web
+                # server) never write to the same one
+                with tempfile.NamedTemporaryFile(
+                    "wb", dir=self.fix_cache_path.parent, suffix=".tmp", delete=False
+                ) as f:
+                    f.write(json_dumps(fix_cache))
+                os.replace(f.name, self.fix_cache_path)
+            except OSError as e:
+                log.warning("[WARNING] Could not save fix cache: %s", e)
+    
+    def _request_fix_contents_batch(self, pending: Dict) -> Dict[str, str]:
+        """
+        Request fixes for several impacted sites with a Batch API job,
+        falling back to realtime requests if the job times out or fails.
+        
+        Args:
+            pending: Dict mapping fix cache keys to ImpactedCode objects
+            
+        Returns:
+            Dict mapping fix cache keys to response content (missing on failure)
+        """
+        try:
+            return self._run_batch(pending)
+        except Exception as e:
+            log.warning("[WARNING] Batch AI fix generation failed (%s), requesting fixes in realtime", e)
+            return self._realtime_fetch()(pending)
+    
+    def _run_batch(self, pending: Dict) -> Dict[str, str]:
+        """
+        Upload requests as a batch job, wait for it and collect the results.
+        
+        Args:
+            pending: Dict mapping fix cache keys to ImpactedCode objects
+            
+        Returns:
+            Dict mapping fix cache keys to response content (missing on failure)
+            
+        Raises:
+            TimeoutError: If the job is not finished within BATCH_MAX_WAIT
+                (it is cancelled)
+            RuntimeError: If the job ends without an output file
+        """
+        # One request per chunk, identified by its first site's cache key
+        chunks = {chunk[0][0]: chunk for chunk in self._chunk_pending(pending)}
+        
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as f:
+            for custom_id, chunk in chunks.items():
+                f.write(json.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._build_request_body(self._build_chunk_prompt(chunk), len(chunk))
+                }))
+                f.write("\n")
+            input_path = f.name
+        
+        try:
+            with open(input_path, "rb") as f:
+                input_file = self.client.files.create(file=f, purpose="batch")
+        finally:
+            os.unlink(input_path)
+        
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.BATCH_COMPLETION_WINDOW
+        )
+        deadline = time.monotonic() + self.BATCH_MAX_WAIT
+        while batch.status not in self.BATCH_TERMINAL_STATES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                try:
+                    self.client.batches.cancel(batch.id)
+                except Exception as e:
+                    log.warning("[WARNING] Could not cancel batch %s: %s", batch.id, e)
+                raise TimeoutError(f"batch {batch.id} not finished after {self.BATCH_MAX_WAIT:.0f}s")
+            time.sleep(min(self.BATCH_POLL_INTERVAL, remaining))
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if not batch.output_file_id:
+            raise RuntimeError(f"batch {batch.id} ended with status '{batch.status}'")
+        
+        contents = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line:
+                continue
+            result = json_loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            chunk = chunks.get(result["custom_id"])
+            if chunk is None:
+                continue
+            try:
+                contents.update(self._split_chunk_content(chunk, response["body"]["choices"][0]["message"]["content"]))
+            except Exception as e:
+                log.warning("[WARNING] Failed to parse LLM response: %s", e)
+        return contents
+    
     def export_fix_report(self, fixes: List[AIFix]) -> Dict:
         """
         Export fixes as a structured report.
@@ -278,20 +914,49 @@ Common migration steps:
         return {
             'total_fixes': len(fixes),
             'average_confidence': sum(f.confidence for f in fixes) / len(fixes) if fixes else 0,
-            'fixes': [
-                {
-                    'package': fix.package_name,
-                    'version_change': f"{fix.current_version} -> {fix.latest_version}",
-                    'file': fix.file_path,
-                    'line': fix.line_number,
-                    'original_code': fix.original_code,
-                    'explanation': fix.explanation,
-                    'fixed_code': fix.fixed_code,
-                    'migration_notes': fix.migration_notes,
-                    'confidence': fix.confidence
-                }
-                for fix in fixes
-            ]
+            'fixes': [self._fix_record(fix) for fix in fixes]
+        }
+    
+    def save_fix_report(self, fixes: List[AIFix], output_file: str):
+        """
+        Write the export_fix_report() structure to a JSON file, serializing
+        one fix at a time instead of building the whole report first.
+        
+        Args:
+            fixes: List of AIFix objects
+            output_file: Output file path
+        """
+        average = sum(f.confidence for f in fixes) / len(fixes) if fixes else 0
+        
+        with open(output_file, 'wb') as f:
+            f.write(b'{"total_fixes":%d,"average_confidence":%s,"fixes":[' % (len(fixes), json_dumps(average)))
+            for i, fix in enumerate(fixes):
+                if i:
+                    f.write(b',')
+                f.write(json_dumps(self._fix_record(fix)))
+            f.write(b']}')
+    
+    @staticmethod
+    def _fix_record(fix: AIFix) -> Dict:
+        """
+        Convert a fix into its report entry.
+        
+        Args:
+            fix: AIFix object
+            
+        Returns:
+            Dictionary with fix information
+        """
+        return {
+            'package': fix.package_name,
+            'version_change': f"{fix.current_version} -> {fix.latest_version}",
+            'file': fix.file_path,
+            'line': fix.line_number,
+            'original_code': fix.original_code,
+            'explanation': fix.explanation,
+            'fixed_code': fix.fixed_code,
+            'migration_notes': fix.migration_notes,
+            'confidence': fix.confidence
         }
 
 
@@ -299,13 +964,13 @@ def main():
     """
     Test the AIFixer module.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("=" * 60)
     print("Testing AIFixer")
     print("=" * 60)
     
     # Mock impacted code
-    import sys
-    from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent))
     
     from core.impact_mapper import ImpactedCode
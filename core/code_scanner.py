@@ -9,12 +9,31 @@ Uses Python AST (Abstract Syntax Tree) to scan Python files and detect:
 """
 
 import ast
+import hashlib
+import logging
+import mmap
+import os
+import re
+import sys
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Tuple
+from typing import List, Dict, Set, FrozenSet, Iterable, Iterator, Optional, Pattern, Tuple
 from dataclasses import dataclass, field
 
+try:
+    from ._compat import DATACLASS_SLOTS, json_dumps, json_loads
+except ImportError:  # run directly as a script (python core/code_scanner.py)
+    from _compat import DATACLASS_SLOTS, json_dumps, json_loads
 
-@dataclass
+log = logging.getLogger("depintel")
+
+
+@dataclass(**DATACLASS_SLOTS)
 class CodeUsage:
     """
     Represents a code usage instance.
@@ -38,7 +57,7 @@ class CodeUsage:
         return f"{self.package_name}.{self.api_element} at {Path(self.file_path).name}:{self.line_number}"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PackageUsageReport:
     """
     Report of all usages for a specific package.
@@ -53,6 +72,73 @@ class PackageUsageReport:
     total_usages: int = 0
     files_affected: Set[str] = field(default_factory=set)
     usages: List[CodeUsage] = field(default_factory=list)
+    
+    def add(self, usage: CodeUsage):
+        """Record a usage of this package."""
+        self.usages.append(usage)
+        self.files_affected.add(usage.file_path)
+        self.total_usages += 1
+
+
+@dataclass(**DATACLASS_SLOTS)
+class PythonFileListing:
+    """
+    The Python files found under a directory, with their stat data.
+    
+    Discovery does not depend on which packages are scanned for, so it can
+    run before (and overlap with) the work that decides the targets.
+    
+    Attributes:
+        exclude_dirs: Directory names that were skipped
+        paths: Python file paths, in os.walk order
+        stats: (mtime_ns, size) per path, or None if the file could not be stat'ed
+    """
+    exclude_dirs: FrozenSet[str]
+    paths: List[str]
+    stats: List[Optional[Tuple[int, int]]]
+
+
+DEFAULT_SCAN_CACHE_DIR = Path.home() / ".cache" / "depintel" / "scan"
+
+DEFAULT_EXCLUDE_DIRS = frozenset({
+    '__pycache__', '.git', '.venv', 'venv', 'env',
+    'node_modules', '.tox', 'build', 'dist', '.eggs'
+})
+
+# Below this many target packages, dotted-prefix set lookups beat a regex
+TARGET_PATTERN_MIN_PACKAGES = 8
+
+
+@lru_cache(maxsize=16)
+def _target_pattern(target_packages: FrozenSet[str]) -> Optional[Pattern]:
+    """
+    Compile a regex matching module names that belong to any of the
+    target packages, for large target sets.
+    
+    Alternatives are ordered longest first so the most specific package
+    wins. Cached per target set, so each worker process compiles it once.
+    
+    Args:
+        target_packages: Normalized package names
+        
+    Returns:
+        Compiled pattern whose group 1 is the matched package, or None if
+        there are too few targets for it to pay off
+    """
+    if len(target_packages) < TARGET_PATTERN_MIN_PACKAGES:
+        return None
+    alternation = '|'.join(sorted(map(re.escape, target_packages), key=len, reverse=True))
+    return re.compile(r'(' + alternation + r')(?:\.|$)')
+
+
+# Node types that cannot contain a Call, Attribute or import, so the walk
+# never descends into them: constants, bare names, import aliases,
+# name-only statements, expression contexts and operator tokens
+_LEAF_NODE_TYPES = frozenset(
+    [ast.Constant, ast.Name, ast.alias, ast.Pass, ast.Break, ast.Continue, ast.Global, ast.Nonlocal]
+    + [op for base in (ast.expr_context, ast.operator, ast.unaryop, ast.cmpop, ast.boolop)
+       for op in base.__subclasses__()]
+)
 
 
 class ASTVisitor(ast.NodeVisitor):
@@ -60,7 +146,7 @@ class ASTVisitor(ast.NodeVisitor):
     Custom AST visitor to extract package usage information.
     """
     
-    def __init__(self, file_path: str, target_packages: Set[str]):
+    def __init__(self, file_path: str, target_packages: FrozenSet[str]):
         """
         Initialize the AST visitor.
         
@@ -72,39 +158,116 @@ class ASTVisitor(ast.NodeVisitor):
         self.target_packages = target_packages
         self.usages: List[CodeUsage] = []
         self.imported_modules: Dict[str, str] = {}  # alias -> full_name
-        self.source_lines: List[str] = []
+        self.source = b""
+        self._source_lines: Optional[List[bytes]] = None
+        self._target_match_cache: Dict[str, Optional[str]] = {}  # module_name -> package
+        self._dispatch = {
+            ast.Import: self.visit_Import,
+            ast.ImportFrom: self.visit_ImportFrom,
+            ast.Call: self.visit_Call,
+            ast.Attribute: self.visit_Attribute,
+        }
     
-    def set_source_lines(self, source_lines: List[str]):
-        """Set the source code lines for context extraction."""
-        self.source_lines = source_lines
+    def visit(self, node: ast.AST):
+        """
+        Walk the tree rooted at node, calling the matching visit_* handler
+        for every node in pre-order (the same order as ast.NodeVisitor).
+        
+        Handlers are looked up in a dict keyed by node class rather than
+        NodeVisitor's per-node getattr, and leaf nodes are not descended into.
+        """
+        dispatch = self._dispatch
+        iter_child_nodes = ast.iter_child_nodes
+        leaf_types = _LEAF_NODE_TYPES
+        
+        def walk(node):
+            handler = dispatch.get(type(node))
+            if handler is not None:
+                handler(node)
+            for child in iter_child_nodes(node):
+                if type(child) not in leaf_types:
+                    walk(child)
+        
+        walk(node)
+    
+    def set_source(self, source):
+        """
+        Set the raw source (bytes or a memory-mapped file) for context
+        extraction. It must stay readable until the visit is finished.
+        """
+        self.source = source
+        self._source_lines = None
     
     def _get_context(self, line_number: int) -> str:
-        """Get the source code line for context."""
-        if 0 < line_number <= len(self.source_lines):
-            return self.source_lines[line_number - 1].strip()
+        """
+        Get the source code line for context.
+        
+        The source is only split into lines once the first usage needs it
+        (most lines never do), and only the requested line is decoded.
+        bytes.splitlines() breaks on the same \n, \r\n and \r endings as
+        the tokenizer, so indexes line up with AST line numbers.
+        """
+        if self._source_lines is None:
+            self._source_lines = self.source[:].splitlines()
+        if 0 < line_number <= len(self._source_lines):
+            return self._source_lines[line_number - 1].decode('utf-8', errors='replace').strip()
         return ""
     
     def _is_target_package(self, module_name: str) -> Optional[str]:
         """
         Check if a module name matches any target package.
         
+        The same imported module names are checked for every call and
+        attribute that uses them, so results are memoized per file. Matched
+        names are interned so every usage of a package shares one string.
+        
         Args:
             module_name: Module name to check
             
         Returns:
             Matched package name or None
         """
+        try:
+            return self._target_match_cache[module_name]
+        except KeyError:
+            package = self._match_target_package(module_name)
+            if package is not None:
+                package = sys.intern(package)
+            self._target_match_cache[module_name] = package
+            return package
+    
+    def _match_target_package(self, module_name: str) -> Optional[str]:
+        """
+        Uncached implementation of _is_target_package.
+        
+        Looks up the module name and then each of its parent packages
+        ("a", "a.b", ...) in the target set, so the cost depends on the
+        module's depth rather than the number of target packages; large
+        target sets use a single precompiled regex instead. Module names
+        are normalized like the targets (lowercase, '_' -> '-').
+        """
         if not module_name:
             return None
         
+        targets = self.target_packages
+        name = module_name.lower().replace('_', '-')
+        
+        pattern = _target_pattern(targets)
+        if pattern is not None:
+            match = pattern.match(name)
+            return match.group(1) if match else None
+        
         # Direct match
-        if module_name in self.target_packages:
-            return module_name
+        if name in targets:
+            return name
         
         # Check if it's a submodule of a target package
-        for package in self.target_packages:
-            if module_name.startswith(f"{package}."):
-                return package
+        dot = name.find('.')
+        while dot != -1:
+            prefix = name[:dot]
+            if prefix in targets:
+                return prefix
+            dot = name.find('.', dot + 1)
         
         return None
     
@@ -125,8 +288,6 @@ class ASTVisitor(ast.NodeVisitor):
                     context=self._get_context(node.lineno)
                 )
                 self.usages.append(usage)
-        
-        self.generic_visit(node)
     
     def visit_ImportFrom(self, node: ast.ImportFrom):
         """Visit from-import statements: from package import item"""
@@ -146,8 +307,6 @@ class ASTVisitor(ast.NodeVisitor):
                         context=self._get_context(node.lineno)
                     )
                     self.usages.append(usage)
-        
-        self.generic_visit(node)
     
     def visit_Call(self, node: ast.Call):
         """Visit function/method calls"""
@@ -156,7 +315,7 @@ class ASTVisitor(ast.NodeVisitor):
         
         if func_name:
             # Check if it's a call to an imported module
-            base_name = func_name.split('.')[0]
+            base_name = func_name.partition('.')[0]
             if base_name in self.imported_modules:
                 full_name = self.imported_modules[base_name]
                 package = self._is_target_package(full_name)
@@ -171,15 +330,13 @@ class ASTVisitor(ast.NodeVisitor):
                         context=self._get_context(node.lineno)
                     )
                     self.usages.append(usage)
-        
-        self.generic_visit(node)
     
     def visit_Attribute(self, node: ast.Attribute):
         """Visit attribute access: obj.attr"""
         full_name = self._extract_name(node)
         
         if full_name:
-            base_name = full_name.split('.')[0]
+            base_name = full_name.partition('.')[0]
             if base_name in self.imported_modules:
                 module_name = self.imported_modules[base_name]
                 package = self._is_target_package(module_name)
@@ -194,8 +351,6 @@ class ASTVisitor(ast.NodeVisitor):
                         context=self._get_context(node.lineno)
                     )
                     self.usages.append(usage)
-        
-        self.generic_visit(node)
     
     def _extract_name(self, node) -> Optional[str]:
         """
@@ -207,16 +362,172 @@ class ASTVisitor(ast.NodeVisitor):
         Returns:
             Full name string or None
         """
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            value_name = self._extract_name(node.value)
-            if value_name:
-                return f"{value_name}.{node.attr}"
-            return node.attr
-        elif isinstance(node, ast.Call):
-            return self._extract_name(node.func)
+        # Walk down the .value/.func chain collecting names, then join them
+        # once (no recursion or intermediate strings). An unnamed base such
+        # as a subscript or literal is dropped, leaving just the attributes.
+        parts = []
+        while True:
+            node_type = type(node)
+            if node_type is ast.Attribute:
+                parts.append(node.attr)
+                node = node.value
+            elif node_type is ast.Name:
+                parts.append(node.id)
+                break
+            elif node_type is ast.Call:
+                node = node.func
+            else:
+                break
+        
+        if not parts:
+            return None
+        parts.reverse()
+        return '.'.join(parts)
+
+
+def build_import_filter(target_packages: Iterable[str]) -> Optional[Pattern]:
+    """
+    Compile a single regex that matches any import statement mentioning
+    one of the target packages.
+    
+    Usages are only recorded for names bound by a matching import, so a
+    file with no match cannot contain any usages and its AST does not
+    need to be built. The pattern tolerates indentation, semicolon-joined
+    statements, comma-separated imports and backslash continuations.
+    
+    Args:
+        target_packages: Package names to look for
+        
+    Returns:
+        Compiled pattern, or None if there are no target packages
+    """
+    if not target_packages:
         return None
+    
+    # Targets are normalized ('-' separators, lowercase) while module names
+    # use '_' and any case, so match both spellings case-insensitively
+    alternation = '|'.join(re.escape(pkg).replace(r'\-', '[-_]') for pkg in sorted(target_packages))
+    pattern = r'\b(?:import|from)\s(?:[^\n\\]|\\.)*?\b(?:' + alternation + r')\b'
+    # Compiled as bytes so it can scan memory-mapped source files directly
+    return re.compile(pattern.encode('ascii'), re.DOTALL | re.IGNORECASE)
+
+
+def _iter_python_files(directory: Path, exclude_dirs: Set[str]) -> Iterator[os.DirEntry]:
+    """
+    Yield the .py files under a directory, in the same top-down order as
+    os.walk.
+    
+    Uses os.scandir directly so directory entries are classified from
+    the readdir type information and each file's stat result is available
+    without a second path lookup.
+    
+    Args:
+        directory: Directory to search
+        exclude_dirs: Directory names to skip (hidden directories are
+            always skipped)
+        
+    Yields:
+        os.DirEntry for each Python file
+    """
+    stack = [str(directory)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        
+        subdirs = []
+        with entries:
+            for entry in entries:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in exclude_dirs and not name.startswith('.'):
+                            subdirs.append(entry.path)
+                    elif name.endswith('.py') and entry.is_file():
+                        yield entry
+                except OSError:
+                    continue
+        
+        # Reversed so the first subdirectory is popped (and walked) first
+        stack.extend(reversed(subdirs))
+
+
+def list_python_files(directory: Path, exclude_dirs: Optional[Set[str]] = None) -> PythonFileListing:
+    """
+    Find and stat the Python files under a directory.
+    
+    Args:
+        directory: Directory to search
+        exclude_dirs: Directory names to skip (default: DEFAULT_EXCLUDE_DIRS)
+    
+    Returns:
+        PythonFileListing for the directory
+    """
+    exclude_dirs = DEFAULT_EXCLUDE_DIRS if exclude_dirs is None else frozenset(exclude_dirs)
+    
+    # Stat the files on the way so unchanged ones can reuse earlier results
+    paths = []
+    stats = []
+    for entry in _iter_python_files(directory, exclude_dirs):
+        paths.append(entry.path)
+        try:
+            st = entry.stat()
+        except OSError:
+            stats.append(None)
+            continue
+        stats.append((st.st_mtime_ns, st.st_size))
+    
+    return PythonFileListing(exclude_dirs, paths, stats)
+
+
+def _scan_one_file(file_path: Path, target_packages: FrozenSet[str],
+                   import_filter: Optional[Pattern] = None) -> List[CodeUsage]:
+    """
+    Scan a single Python file for usages of the target packages.
+    
+    Module-level so it can be pickled and run in worker processes.
+    
+    Args:
+        file_path: Path to Python file
+        target_packages: Set of normalized package names to track
+        import_filter: Optional pattern from build_import_filter(); files
+            it does not match are skipped without parsing
+        
+    Returns:
+        List of CodeUsage instances
+    """
+    try:
+        # Map the file rather than reading it so that files rejected by the
+        # import filter are never copied into Python objects
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                if import_filter is not None and not import_filter.search(source):
+                    return []
+                
+                # Parse the AST (from bytes, so PEP 263 encoding cookies are honoured)
+                tree = ast.parse(source, filename=str(file_path))
+                
+                # One interned path string shared by every usage in the file
+                path = sys.intern(str(file_path))
+                
+                # Visit the AST while the mapping is open so contexts can be
+                # read straight from it
+                visitor = ASTVisitor(path, target_packages)
+                visitor.set_source(source)
+                visitor.visit(tree)
+        
+        return visitor.usages
+        
+    except SyntaxError as e:
+        log.warning("[WARNING] Syntax error in %s: %s", file_path, e)
+        return []
+    except Exception as e:
+        log.warning("[WARNING] Failed to scan %s: %s", file_path, e)
+        return []
 
 
 class CodeScanner:
@@ -228,16 +539,46 @@ class CodeScanner:
     - Tracks imports, function calls, and attribute access
     - Records exact file and line numbers
     - Provides detailed usage reports
+    - Skips files that never import a target package
+    - Parallel scanning across processes for large repositories
     """
     
-    def __init__(self, target_packages: Set[str]):
+    # Below this many files, process start-up costs more than it saves
+    PARALLEL_THRESHOLD = 64
+    
+    # Scans may run on a background thread while other threads are doing
+    # network I/O; forking then could copy held locks into the workers, so
+    # start them from a clean forkserver process where the platform allows
+    POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None
+    
+    # Process-wide memo of per-file results, so a rescan after a few edits
+    # only re-parses the edited files. Scanners may run on concurrent
+    # threads (e.g. web server requests), so every access holds the lock.
+    # Maps path -> ((mtime_ns, size, targets), usages)
+    _file_cache: Dict[str, Tuple[Tuple, List[CodeUsage]]] = {}
+    _file_cache_lock = threading.RLock()
+    FILE_CACHE_SIZE = 100_000
+    
+    # On-disk copies of the per-file memo already merged into this process,
+    # one JSON file per scanned directory so a run only rewrites its own
+    # entries. Bump the version whenever a change to scanning alters the
+    # usages found (or the file layout), so results persisted by older code
+    # are discarded.
+    _loaded_cache_paths: Set[Path] = set()
+    SCAN_CACHE_VERSION = 3
+    
+    def __init__(self, target_packages: Iterable[str], cache_dir: Optional[str] = None):
         """
         Initialize the code scanner.
         
         Args:
             target_packages: Set of package names to track
+            cache_dir: Directory persisting per-file scan results between
+                runs, one file per scanned directory (default: ~/.cache/depintel/scan)
         """
-        self.target_packages = {pkg.lower().replace('_', '-') for pkg in target_packages}
+        self.target_packages = frozenset(pkg.lower().replace('_', '-') for pkg in target_packages)
+        self.import_filter = build_import_filter(self.target_packages)
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_SCAN_CACHE_DIR
         self.usage_reports: Dict[str, PackageUsageReport] = {}
     
     def scan_file(self, file_path: Path) -> List[CodeUsage]:
@@ -250,79 +591,236 @@ class CodeScanner:
         Returns:
             List of CodeUsage instances
         """
+        path = str(file_path)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source = f.read()
-                source_lines = source.splitlines()
-            
-            # Parse the AST
-            tree = ast.parse(source, filename=str(file_path))
-            
-            # Visit the AST
-            visitor = ASTVisitor(str(file_path), self.target_packages)
-            visitor.set_source_lines(source_lines)
-            visitor.visit(tree)
-            
-            return visitor.usages
+            st = os.stat(path)
+        except OSError:
+            return _scan_one_file(file_path, self.target_packages, self.import_filter)
+        
+        stamp = (st.st_mtime_ns, st.st_size, self.target_packages)
+        with self._file_cache_lock:
+            cached = self._file_cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        
+        usages = _scan_one_file(file_path, self.target_packages, self.import_filter)
+        self._remember_file(path, stamp, usages)
+        return usages
+    
+    @classmethod
+    def _remember_file(cls, path: str, stamp: Tuple, usages: List[CodeUsage]):
+        """
+        Store a file's scan result in the per-file memo, evicting the
+        oldest entry when it is full.
+        
+        Args:
+            path: File path
+            stamp: (mtime_ns, size, target packages) the result is valid for
+            usages: Usages found in the file
+        """
+        with cls._file_cache_lock:
+            if path not in cls._file_cache and len(cls._file_cache) >= cls.FILE_CACHE_SIZE:
+                cls._file_cache.pop(next(iter(cls._file_cache)))
+            cls._file_cache[path] = (stamp, usages)
+    
+    def _cache_file(self, directory: Path) -> Path:
+        """
+        Get the file persisting the per-file results for a scanned directory.
+        
+        Args:
+            directory: Scanned directory
             
-        except SyntaxError as e:
-            print(f"[WARNING] Syntax error in {file_path}: {e}")
-            return []
-        except Exception as e:
-            print(f"[WARNING] Failed to scan {file_path}: {e}")
-            return []
+        Returns:
+            Path of the directory's cache file inside cache_dir
+        """
+        digest = hashlib.blake2b(str(directory).encode('utf-8', 'surrogateescape'), digest_size=16)
+        return self.cache_dir / f"{digest.hexdigest()}.json"
     
-    def scan_directory(self, directory: Path, exclude_dirs: Optional[Set[str]] = None) -> Dict[str, PackageUsageReport]:
+    def _load_file_cache(self, cache_file: Path):
+        """
+        Merge per-file results persisted by earlier scans of a directory
+        into the memo (once per cache file per process). Entries already
+        in memory win.
+        
+        The file is plain JSON, mapping each path to
+        [mtime_ns, size, target packages, usage records]; a file from
+        another cache version, or one that doesn't have that shape, is
+        treated as a cache miss.
+        
+        Args:
+            cache_file: The directory's cache file
+        """
+        with self._file_cache_lock:
+            if cache_file in self._loaded_cache_paths:
+                return
+            self._loaded_cache_paths.add(cache_file)
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                persisted = json_loads(f.read())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log.warning("[WARNING] Ignoring unreadable scan cache %s: %s", cache_file, e)
+            return
+        
+        if not isinstance(persisted, dict) or persisted.get('version') != self.SCAN_CACHE_VERSION:
+            return
+        
+        try:
+            entries = {}
+            for path, (mtime_ns, size, targets, records) in persisted['files'].items():
+                file_path = sys.intern(path)
+                usages = [
+                    CodeUsage(
+                        file_path=file_path,
+                        line_number=int(record['line_number']),
+                        package_name=str(record['package_name']),
+                        api_element=str(record['api_element']),
+                        usage_type=str(record['usage_type']),
+                        context=str(record['context'])
+                    )
+                    for record in records
+                ]
+                entries[path] = ((int(mtime_ns), int(size), frozenset(targets)), usages)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return
+        
+        with self._file_cache_lock:
+            for path, entry in entries.items():
+                if path not in self._file_cache:
+                    self._remember_file(path, *entry)
+    
+    def _save_file_cache(self, cache_file: Path, python_files: List[str]):
+        """
+        Persist the memo entries for one directory's files, replacing its
+        cache file atomically. Other directories' cache files are untouched,
+        and files no longer in the directory are dropped.
+        
+        Args:
+            cache_file: The directory's cache file
+            python_files: Paths of the Python files currently in the directory
+        """
+        with self._file_cache_lock:
+            entries = [(path, self._file_cache.get(path)) for path in python_files]
+        
+        files = {}
+        for path, entry in entries:
+            if entry is None:
+                continue
+            (mtime_ns, size, targets), usages = entry
+            files[path] = [
+                mtime_ns, size, sorted(targets),
+                [
+                    {
+                        'line_number': usage.line_number,
+                        'package_name': usage.package_name,
+                        'api_element': usage.api_element,
+                        'usage_type': usage.usage_type,
+                        'context': usage.context
+                    }
+                    for usage in usages
+                ]
+            ]
+        
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json_dumps({'version': self.SCAN_CACHE_VERSION, 'files': files}))
+            os.replace(tmp_path, cache_file)
+        except OSError as e:
+            log.warning("[WARNING] Could not save scan cache: %s", e)
+    
+    def scan_directory(self, directory: Path, exclude_dirs: Optional[Set[str]] = None,
+                       processes: Optional[int] = None,
+                       listing: Optional[PythonFileListing] = None) -> Dict[str, PackageUsageReport]:
         """
         Scan all Python files in a directory.
         
         Args:
             directory: Directory to scan
             exclude_dirs: Set of directory names to exclude
-            
+            processes: Number of worker processes (default: CPU count)
+            listing: Files already found by list_python_files(directory);
+                when given, exclude_dirs is ignored and discovery is skipped
+        
         Returns:
             Dictionary mapping package names to usage reports
         """
-        if exclude_dirs is None:
-            exclude_dirs = {
-                '__pycache__', '.git', '.venv', 'venv', 'env',
-                'node_modules', '.tox', 'build', 'dist', '.eggs'
-            }
+        log.info("[INFO] Scanning directory: %s", directory)
         
-        print(f"[INFO] Scanning directory: {directory}")
+        if listing is None:
+            listing = list_python_files(directory, exclude_dirs)
+        python_files = listing.paths
+        stamps = [
+            None if stat is None else (*stat, self.target_packages)
+            for stat in listing.stats
+        ]
         
-        # Find all Python files
-        python_files = []
-        for root, dirs, files in directory.walk():
-            # Filter out excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs and not d.startswith('.')]
-            
-            for file in files:
-                if file.endswith('.py'):
-                    python_files.append(root / file)
+        log.info("[INFO] Found %s Python files", len(python_files))
+        
+        # Reuse per-file results for files unchanged since they were last
+        # scanned, by this process or (via the cache file) an earlier one
+        cache_file = self._cache_file(directory)
+        self._load_file_cache(cache_file)
+        file_usages: List[Optional[List[CodeUsage]]] = [None] * len(python_files)
+        stale = []
+        with self._file_cache_lock:
+            file_cache = self._file_cache
+            for i, (py_file, stamp) in enumerate(zip(python_files, stamps)):
+                cached = file_cache.get(py_file)
+                if cached and stamp is not None and cached[0] == stamp:
+                    file_usages[i] = cached[1]
+                else:
+                    stale.append(i)
         
-        print(f"[INFO] Found {len(python_files)} Python files")
+        # Scan the rest, in parallel when there are enough to amortize the pool
+        stale_files = [python_files[i] for i in stale]
+        results = None
+        if len(stale_files) >= self.PARALLEL_THRESHOLD:
+            worker = partial(
+                _scan_one_file,
+                target_packages=self.target_packages,
+                import_filter=self.import_filter
+            )
+            chunksize = max(1, len(stale_files) // ((processes or os.cpu_count() or 1) * 4))
+            context = multiprocessing.get_context(self.POOL_START_METHOD)
+            try:
+                with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+                    results = list(executor.map(worker, stale_files, chunksize=chunksize))
+            except (BrokenProcessPool, OSError) as e:
+                # Worker processes could not start or died (no __main__ guard
+                # in the caller, sandboxed process creation, no /dev/shm, ...)
+                log.warning("[WARNING] Parallel scan failed (%s), scanning serially", e)
         
-        # Scan each file
-        all_usages = []
-        for py_file in python_files:
-            usages = self.scan_file(py_file)
-            all_usages.extend(usages)
+        if results is None:
+            results = [_scan_one_file(py_file, self.target_packages, self.import_filter) for py_file in stale_files]
+        
+        with self._file_cache_lock:
+            for i, usages in zip(stale, results):
+                file_usages[i] = usages
+                if stamps[i] is not None:
+                    self._remember_file(python_files[i], stamps[i], usages)
+        
+        all_usages = [usage for usages in file_usages for usage in usages]
+        
+        if len(stale_files) < len(python_files):
+            log.info("[INFO] Reused results for %s unchanged files", len(python_files) - len(stale_files))
+        if stale_files:
+            self._save_file_cache(cache_file, python_files)
         
         # Build usage reports
         self.usage_reports = {}
         for usage in all_usages:
-            if usage.package_name not in self.usage_reports:
-                self.usage_reports[usage.package_name] = PackageUsageReport(
+            report = self.usage_reports.get(usage.package_name)
+            if report is None:
+                report = self.usage_reports[usage.package_name] = PackageUsageReport(
                     package_name=usage.package_name
                 )
-            
-            report = self.usage_reports[usage.package_name]
-            report.usages.append(usage)
-            report.files_affected.add(usage.file_path)
-            report.total_usages += 1
+            report.add(usage)
         
-        print(f"[OK] Scanned {len(python_files)} files, found {len(all_usages)} usages")
+        log.info("[OK] Scanned %s files, found %s usages", len(python_files), len(all_usages))
         
         return self.usage_reports
     
@@ -353,26 +851,61 @@ class CodeScanner:
                     'name': report.package_name,
                     'total_usages': report.total_usages,
                     'files_affected': len(report.files_affected),
-                    'usages': [
-                        {
-                            'file': usage.file_path,
-                            'line': usage.line_number,
-                            'api': usage.api_element,
-                            'type': usage.usage_type,
-                            'context': usage.context
-                        }
-                        for usage in report.usages
-                    ]
+                    'usages': [self._usage_record(usage) for usage in report.usages]
                 }
                 for report in self.usage_reports.values()
             ]
         }
+    
+    def save_summary(self, output_file: str):
+        """
+        Write the export_summary() structure to a JSON file, serializing
+        one usage at a time instead of building the whole summary first.
+        
+        Args:
+            output_file: Output file path
+        """
+        with open(output_file, 'wb') as f:
+            f.write(b'{"total_packages_found":%d,"packages":[' % len(self.usage_reports))
+            for i, report in enumerate(self.usage_reports.values()):
+                if i:
+                    f.write(b',')
+                f.write(b'{"name":%s,"total_usages":%d,"files_affected":%d,"usages":[' % (
+                    json_dumps(report.package_name), report.total_usages, len(report.files_affected)
+                ))
+                for j, usage in enumerate(report.usages):
+                    if j:
+                        f.write(b',')
+                    f.write(json_dumps(self._usage_record(usage)))
+                f.write(b']}')
+            f.write(b']}')
+    
+    @staticmethod
+    def _usage_record(usage: CodeUsage) -> Dict:
+        """
+        Convert a usage into its summary entry.
+        
+        Args:
+            usage: CodeUsage instance
+            
+        Returns:
+            Dictionary with usage information
+        """
+        return {
+            'file': usage.file_path,
+            'line': usage.line_number,
+            'api': usage.api_element,
+            'type': usage.usage_type,
+            'context': usage.context
+        }
 
 
 def main():
     """
     Test the CodeScanner module.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("=" * 60)
     print("Testing CodeScanner")
     print("=" * 60)
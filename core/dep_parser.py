@@ -9,11 +9,16 @@ Supports multiple dependency file formats:
 - setup.cfg
 """
 
+import os
 import re
+import sys
 import ast
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 
 # Optional: for TOML parsing
 try:
@@ -24,8 +29,44 @@ except ImportError:
     except ImportError:
         toml = None
 
+try:
+    from ._compat import DATACLASS_SLOTS
+except ImportError:  # run directly as a script (python core/dep_parser.py)
+    from _compat import DATACLASS_SLOTS
+
+log = logging.getLogger("depintel")
+
+
+# PEP 503 separator runs, collapsed to a single '-' during normalization
+_NORMALIZE_RE = re.compile(r'[-_.]+')
+
+# Parsed operators are interned, so every Dependency shares one string per
+# operator and the pinned checks below compare by identity first
+_PINNED_OPERATOR = sys.intern('==')
+
+
+@lru_cache(maxsize=4096)
+def _normalize_name(name: str) -> str:
+    """
+    Normalize a package name according to PEP 503.
+    
+    Cached, since the same names are normalized once per dependency file
+    they appear in and again on every lookup.
+    
+    Args:
+        name: Package name as written
+        
+    Returns:
+        Lowercased name with separator runs collapsed to '-'
+    """
+    normalized = name.lower()
+    # Most names have no separators at all; skip the regex for those
+    if normalized.isalnum():
+        return normalized
+    return _NORMALIZE_RE.sub('-', normalized)
+
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Dependency:
     """
     Represents a Python package dependency.
@@ -76,9 +117,39 @@ class DependencyParser:
         r'([0-9a-zA-Z.*+-]+)?'
     )
     
+    # REQUIREMENT_PATTERN applied at the start of every line of a whole
+    # file; whitespace excludes '\n' so a match never spills onto the next line
+    REQUIREMENT_LINE_PATTERN = re.compile(
+        r'^[^\S\n]*'
+        r'([a-zA-Z0-9]([a-zA-Z0-9._-]*[a-zA-Z0-9])?)'
+        r'(\[[a-zA-Z0-9,_-]+\])?'
+        r'[^\S\n]*'
+        r'([=<>!~]=?)?'
+        r'[^\S\n]*'
+        r'([0-9a-zA-Z.*+-]+)?',
+        re.MULTILINE
+    )
+    
+    # Operator-prefixed version strings from Poetry and Pipfile tables
+    OPERATOR_VERSION_PATTERN = re.compile(r'^([=<>!~]+)(.+)$')
+    
+    # Direct references that are not named requirements
+    URL_PREFIXES = ('git+', 'http://', 'https://', 'svn+', 'hg+')
+    
+    # Upper bound on dependency files read concurrently
+    MAX_PARSE_WORKERS = 8
+    
+    # Parsed files keyed by path, valid while (mtime_ns, size) is unchanged.
+    # Shared by all instances so repeated analyses of a repository skip
+    # unchanged files
+    _file_cache: Dict[str, Tuple[Tuple[int, int], List[Dependency]]] = {}
+    FILE_CACHE_SIZE = 10_000
+    
     def __init__(self):
         """Initialize the DependencyParser."""
         self.dependencies: Dict[str, Dependency] = {}
+        # (pinned, unpinned) split of self.dependencies, reset on every merge
+        self._partition: Optional[Tuple[List[Dependency], List[Dependency]]] = None
     
     def find_dependency_files(self, repo_path: Path) -> Dict[str, List[Path]]:
         """
@@ -98,28 +169,49 @@ class DependencyParser:
             'pipfile': []
         }
         
-        # requirements.txt files
-        for pattern in ["requirements.txt", "requirements-*.txt", "requirements/*.txt"]:
-            files['requirements'].extend(repo_path.glob(pattern))
-        
-        # pyproject.toml
-        files['pyproject'].extend(repo_path.glob("pyproject.toml"))
-        
-        # setup.py
-        files['setup_py'].extend(repo_path.glob("setup.py"))
-        
-        # setup.cfg
-        files['setup_cfg'].extend(repo_path.glob("setup.cfg"))
-        
-        # Pipfile
-        files['pipfile'].extend(repo_path.glob("Pipfile"))
-        
-        # Remove duplicates and sort
-        for key in files:
-            files[key] = sorted(set(files[key]))
+        # One directory listing for the repository root (plus one for a
+        # requirements/ subdirectory) instead of a glob per pattern
+        for name in self._list_files(repo_path):
+            if name == "requirements.txt" or (name.startswith("requirements-") and name.endswith(".txt")):
+                files['requirements'].append(repo_path / name)
+            elif name == "pyproject.toml":
+                files['pyproject'].append(repo_path / name)
+            elif name == "setup.py":
+                files['setup_py'].append(repo_path / name)
+            elif name == "setup.cfg":
+                files['setup_cfg'].append(repo_path / name)
+            elif name == "Pipfile":
+                files['pipfile'].append(repo_path / name)
+        
+        requirements_dir = repo_path / "requirements"
+        for name in self._list_files(requirements_dir):
+            if name.endswith(".txt"):
+                files['requirements'].append(requirements_dir / name)
+        
+        # Each directory entry is seen once, so only sort (merge order
+        # depends on it)
+        for file_list in files.values():
+            file_list.sort()
         
         return files
     
+    @staticmethod
+    def _list_files(directory: Path) -> List[str]:
+        """
+        List the names of regular files in a directory.
+        
+        Args:
+            directory: Directory to list
+            
+        Returns:
+            File names (empty if the directory does not exist)
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return [entry.name for entry in entries if entry.is_file()]
+        except OSError:
+            return []
+    
     # ========================================================================
     # REQUIREMENTS.TXT PARSING
     # ========================================================================
@@ -130,34 +222,68 @@ class DependencyParser:
         
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, start=1):
-                    dep = self._parse_requirement_line(line, str(file_path), line_num)
-                    if dep:
-                        dependencies.append(dep)
+                text = f.read()
+            
+            source_file = str(file_path)
+            line_number = 1
+            line_start = 0
+            
+            # One regex scan over the whole file; comment, blank and option
+            # lines never match since they don't start with a name character
+            for match in self.REQUIREMENT_LINE_PATTERN.finditer(text):
+                start = match.start(1)
+                line_number += text.count('\n', line_start, start)
+                line_start = start
+                
+                if text.startswith(self.URL_PREFIXES, start):
+                    continue
+                
+                dependencies.append(self._dependency_from_match(match, source_file, line_number))
         except Exception as e:
-            print(f"[WARNING] Failed to parse {file_path}: {e}")
+            log.warning("[WARNING] Failed to parse %s: %s", file_path, e)
         
         return dependencies
     
-    def _parse_requirement_line(self, line: str, source_file: str, line_number: int) -> Optional[Dependency]:
+    def _parse_requirement_line(
+        self,
+        line: str,
+        source_file: str,
+        line_number: int,
+        source_type: str = "requirements"
+    ) -> Optional[Dependency]:
         """Parse a single line from requirements.txt."""
-        line = line.split('#')[0].strip()
-        
-        if not line or line.startswith('-') or line.startswith('--'):
-            return None
-        
-        if any(line.startswith(prefix) for prefix in ['git+', 'http://', 'https://', 'svn+', 'hg+']):
+        comment = line.find('#')
+        if comment >= 0:
+            line = line[:comment]
+        line = line.strip()
+        
+        # Requirement names start with a letter or digit; checking that first
+        # also rules out pip options ('-r', '--index-url', ...) and local
+        # paths without running the regex
+        if not line or not line[0].isalnum() or line.startswith(self.URL_PREFIXES):
             return None
         
         match = self.REQUIREMENT_PATTERN.match(line)
         if not match:
             return None
         
+        return self._dependency_from_match(match, source_file, line_number, source_type)
+    
+    def _dependency_from_match(
+        self,
+        match: re.Match,
+        source_file: str,
+        line_number: int,
+        source_type: str = "requirements"
+    ) -> Dependency:
+        """Build a Dependency from a REQUIREMENT_PATTERN-style match."""
         raw_name = match.group(1)
         operator = match.group(4)
+        if operator:
+            operator = sys.intern(operator)
         version = match.group(5)
         
-        normalized_name = self._normalize_package_name(raw_name)
+        normalized_name = _normalize_name(raw_name)
         version_spec = f"{operator}{version}" if operator and version else None
         
         return Dependency(
@@ -168,7 +294,7 @@ class DependencyParser:
             operator=operator,
             source_file=source_file,
             line_number=line_number,
-            source_type="requirements"
+            source_type=source_type
         )
     
     # ========================================================================
@@ -178,8 +304,8 @@ class DependencyParser:
     def parse_pyproject_toml(self, file_path: Path) -> List[Dependency]:
         """Parse a pyproject.toml file."""
         if toml is None:
-            print(f"[WARNING] tomli/tomllib not available, skipping {file_path}")
-            print("  Install with: pip install tomli")
+            log.warning("[WARNING] tomli/tomllib not available, skipping %s", file_path)
+            log.warning("  Install with: pip install tomli")
             return []
         
         dependencies = []
@@ -215,7 +341,7 @@ class DependencyParser:
                         dependencies.append(dep)
         
         except Exception as e:
-            print(f"[WARNING] Failed to parse {file_path}: {e}")
+            log.warning("[WARNING] Failed to parse %s: %s", file_path, e)
         
         return dependencies
     
@@ -237,15 +363,15 @@ class DependencyParser:
                 return None  # Skip wildcard dependencies
             else:
                 # Try to extract operator
-                match = re.match(r'^([=<>!~]+)(.+)$', version_spec)
+                match = self.OPERATOR_VERSION_PATTERN.match(version_spec)
                 if match:
-                    operator = match.group(1)
+                    operator = sys.intern(match.group(1))
                     version = match.group(2)
                 else:
-                    operator = '=='
+                    operator = _PINNED_OPERATOR
                     version = version_spec
             
-            normalized_name = self._normalize_package_name(name)
+            normalized_name = _normalize_name(name)
             
             return Dependency(
                 name=normalized_name,
@@ -266,23 +392,7 @@ class DependencyParser:
         if not match:
             return None
         
-        raw_name = match.group(1)
-        operator = match.group(4)
-        version = match.group(5)
-        
-        normalized_name = self._normalize_package_name(raw_name)
-        version_spec = f"{operator}{version}" if operator and version else None
-        
-        return Dependency(
-            name=normalized_name,
-            raw_name=raw_name,
-            version_spec=version_spec,
-            version=version,
-            operator=operator,
-            source_file=source_file,
-            line_number=0,
-            source_type="pyproject"
-        )
+        return self._dependency_from_match(match, source_file, 0, source_type="pyproject")
     
     # ========================================================================
     # SETUP.PY PARSING
@@ -296,30 +406,45 @@ class DependencyParser:
             with open(file_path, 'r', encoding='utf-8') as f:
                 tree = ast.parse(f.read())
             
-            # Look for setup() call
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Call):
-                    # Check if it's a setup() call
-                    if isinstance(node.func, ast.Name) and node.func.id == 'setup':
-                        # Look for install_requires keyword
-                        for keyword in node.keywords:
-                            if keyword.arg == 'install_requires':
-                                deps = self._extract_list_from_ast(keyword.value)
-                                for dep_string in deps:
-                                    dep = self._parse_requirement_line(
-                                        dep_string, 
-                                        str(file_path), 
-                                        0
-                                    )
-                                    if dep:
-                                        dep.source_type = "setup_py"
-                                        dependencies.append(dep)
+            # setup() is almost always a top-level statement, so check those
+            # first and only walk the whole tree when it is nested (e.g.
+            # under `if __name__ == "__main__":`)
+            setup_calls = [
+                stmt.value for stmt in tree.body
+                if isinstance(stmt, ast.Expr) and self._is_setup_call(stmt.value)
+            ]
+            if not setup_calls:
+                setup_calls = [node for node in ast.walk(tree) if self._is_setup_call(node)]
+            
+            for node in setup_calls:
+                # Look for install_requires keyword
+                for keyword in node.keywords:
+                    if keyword.arg == 'install_requires':
+                        deps = self._extract_list_from_ast(keyword.value)
+                        for dep_string in deps:
+                            dep = self._parse_requirement_line(
+                                dep_string, 
+                                str(file_path), 
+                                0,
+                                source_type="setup_py"
+                            )
+                            if dep:
+                                dependencies.append(dep)
         
         except Exception as e:
-            print(f"[WARNING] Failed to parse {file_path}: {e}")
+            log.warning("[WARNING] Failed to parse %s: %s", file_path, e)
         
         return dependencies
     
+    @staticmethod
+    def _is_setup_call(node) -> bool:
+        """Check whether an AST node is a call to setup()."""
+        return (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id == 'setup'
+        )
+    
     def _extract_list_from_ast(self, node) -> List[str]:
         """Extract string values from an AST List node."""
         if isinstance(node, ast.List):
@@ -336,7 +461,7 @@ class DependencyParser:
     def parse_pipfile(self, file_path: Path) -> List[Dependency]:
         """Parse a Pipfile."""
         if toml is None:
-            print(f"[WARNING] tomli not available, skipping {file_path}")
+            log.warning("[WARNING] tomli not available, skipping %s", file_path)
             return []
         
         dependencies = []
@@ -353,7 +478,7 @@ class DependencyParser:
                     dependencies.append(dep)
         
         except Exception as e:
-            print(f"[WARNING] Failed to parse {file_path}: {e}")
+            log.warning("[WARNING] Failed to parse %s: %s", file_path, e)
         
         return dependencies
     
@@ -369,17 +494,17 @@ class DependencyParser:
                 version_spec_str = None
             else:
                 # Pipfile uses == by default
-                match = re.match(r'^([=<>!~]+)(.+)$', version_spec)
+                match = self.OPERATOR_VERSION_PATTERN.match(version_spec)
                 if match:
-                    operator = match.group(1)
+                    operator = sys.intern(match.group(1))
                     version = match.group(2)
                     version_spec_str = version_spec
                 else:
-                    operator = '=='
+                    operator = _PINNED_OPERATOR
                     version = version_spec
                     version_spec_str = f"=={version}"
             
-            normalized_name = self._normalize_package_name(name)
+            normalized_name = _normalize_name(name)
             
             return Dependency(
                 name=normalized_name,
@@ -409,6 +534,7 @@ class DependencyParser:
             Dictionary mapping package names to Dependency objects
         """
         self.dependencies = {}
+        self._partition = None
         
         # Find all dependency files
         files = self.find_dependency_files(repo_path)
@@ -416,53 +542,98 @@ class DependencyParser:
         total_files = sum(len(file_list) for file_list in files.values())
         
         if total_files == 0:
-            print("[WARNING] No dependency files found in repository")
+            log.warning("[WARNING] No dependency files found in repository")
             return self.dependencies
         
-        print(f"[INFO] Found {total_files} dependency file(s):")
-        
-        # Parse requirements.txt files
-        for req_file in files['requirements']:
-            print(f"  - {req_file.relative_to(repo_path)} (requirements)")
-            deps = self.parse_requirements_file(req_file)
-            self._merge_dependencies(deps)
-        
-        # Parse pyproject.toml files
-        for toml_file in files['pyproject']:
-            print(f"  - {toml_file.relative_to(repo_path)} (pyproject.toml)")
-            deps = self.parse_pyproject_toml(toml_file)
-            self._merge_dependencies(deps)
-        
-        # Parse setup.py files
-        for setup_file in files['setup_py']:
-            print(f"  - {setup_file.relative_to(repo_path)} (setup.py)")
-            deps = self.parse_setup_py(setup_file)
-            self._merge_dependencies(deps)
-        
-        # Parse Pipfile
-        for pipfile in files['pipfile']:
-            print(f"  - {pipfile.relative_to(repo_path)} (Pipfile)")
-            deps = self.parse_pipfile(pipfile)
-            self._merge_dependencies(deps)
-        
-        print(f"\n[OK] Parsed {len(self.dependencies)} unique dependencies")
+        log.info("[INFO] Found %d dependency file(s):", total_files)
+        
+        # (path, label, parser) in merge order: requirements.txt files,
+        # pyproject.toml, setup.py, then Pipfile
+        jobs = [
+            (path, label, parse)
+            for key, label, parse in (
+                ('requirements', 'requirements', self.parse_requirements_file),
+                ('pyproject', 'pyproject.toml', self.parse_pyproject_toml),
+                ('setup_py', 'setup.py', self.parse_setup_py),
+                ('pipfile', 'Pipfile', self.parse_pipfile),
+            )
+            for path in files[key]
+        ]
+        
+        # Files are parsed concurrently but merged in order, so later files
+        # still override earlier ones exactly as in a sequential parse
+        workers = min(self.MAX_PARSE_WORKERS, len(jobs))
+        
+        # Paths are built as repo_path / name, so a string prefix strip gives
+        # the relative path without a Path.relative_to() per file
+        repo_prefix = os.path.join(os.fspath(repo_path), '')
+        
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            results = executor.map(lambda job: self._parse_cached(job[0], job[2]), jobs)
+            
+            for (path, label, _), deps in zip(jobs, results):
+                file_path = os.fspath(path)
+                if file_path.startswith(repo_prefix):
+                    file_path = file_path[len(repo_prefix):]
+                log.info("  - %s (%s)", file_path, label)
+                self._merge_dependencies(deps)
+        
+        log.info("\n[OK] Parsed %d unique dependencies", len(self.dependencies))
         return self.dependencies
     
+    def _parse_cached(self, file_path: Path, parse) -> List[Dependency]:
+        """
+        Parse a dependency file, reusing the previous result while the
+        file's modification time and size are unchanged.
+        
+        Args:
+            file_path: Dependency file
+            parse: Parser method for the file's format
+            
+        Returns:
+            List of Dependency objects
+        """
+        path = str(file_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return parse(file_path)
+        
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._file_cache.get(path)
+        if cached and cached[0] == stamp:
+            return list(cached[1])
+        
+        dependencies = parse(file_path)
+        if path not in self._file_cache and len(self._file_cache) >= self.FILE_CACHE_SIZE:
+            self._file_cache.pop(next(iter(self._file_cache)), None)
+        self._file_cache[path] = (stamp, dependencies)
+        return list(dependencies)
+    
     def _merge_dependencies(self, deps: List[Dependency]):
         """Merge dependencies into the main dictionary."""
+        self._partition = None
+        
+        # Duplicates are only reported, so when INFO output is disabled
+        # (e.g. --quiet or library use) merge without looking for them
+        if not log.isEnabledFor(logging.INFO):
+            self.dependencies.update((dep.name, dep) for dep in deps)
+            return
+        
         for dep in deps:
-            if dep.name in self.dependencies:
-                existing = self.dependencies[dep.name]
-                print(f"[INFO] Duplicate dependency '{dep.name}':")
-                print(f"  - {existing.source_file} ({existing.source_type})")
-                print(f"  - {dep.source_file} ({dep.source_type})")
-                print(f"  Using: {dep.source_file}")
+            existing = self.dependencies.get(dep.name)
+            if existing is not None:
+                log.info(
+                    "[INFO] Duplicate dependency '%s':\n  - %s (%s)\n  - %s (%s)\n  Using: %s",
+                    dep.name, existing.source_file, existing.source_type,
+                    dep.source_file, dep.source_type, dep.source_file
+                )
             
             self.dependencies[dep.name] = dep
     
     def _normalize_package_name(self, name: str) -> str:
         """Normalize package name according to PEP 503."""
-        return re.sub(r'[-_.]+', '-', name).lower()
+        return _normalize_name(name)
     
     # ========================================================================
     # UTILITY METHODS (keep existing ones)
@@ -470,7 +641,7 @@ class DependencyParser:
     
     def get_dependency(self, package_name: str) -> Optional[Dependency]:
         """Get a specific dependency by name."""
-        normalized = self._normalize_package_name(package_name)
+        normalized = _normalize_name(package_name)
         return self.dependencies.get(normalized)
     
     def get_all_dependencies(self) -> List[Dependency]:
@@ -479,46 +650,63 @@ class DependencyParser:
     
     def get_pinned_dependencies(self) -> List[Dependency]:
         """Get only dependencies with pinned versions (==)."""
-        return [dep for dep in self.dependencies.values() if dep.operator == '==']
+        return list(self._partition_by_pin()[0])
     
     def get_unpinned_dependencies(self) -> List[Dependency]:
         """Get dependencies without version specifications."""
-        return [dep for dep in self.dependencies.values() if dep.operator != '==']
+        return list(self._partition_by_pin()[1])
+    
+    def _partition_by_pin(self) -> Tuple[List[Dependency], List[Dependency]]:
+        """
+        Split the parsed dependencies into pinned (==) and unpinned ones.
+        
+        Both halves come from a single pass and are cached until the next
+        merge, since callers usually ask for both.
+        
+        Returns:
+            Tuple of (pinned, unpinned) lists in parse order
+        """
+        if self._partition is None:
+            pinned, unpinned = [], []
+            for dep in self.dependencies.values():
+                if dep.operator == _PINNED_OPERATOR:
+                    pinned.append(dep)
+                else:
+                    unpinned.append(dep)
+            self._partition = (pinned, unpinned)
+        return self._partition
     
     def export_summary(self) -> Dict:
         """Export a summary of parsed dependencies."""
-        all_deps = self.get_all_dependencies()
-        pinned = self.get_pinned_dependencies()
-        unpinned = self.get_unpinned_dependencies()
-        
-        # Group by source type
-        by_source = {}
-        for dep in all_deps:
-            source_type = dep.source_type
-            if source_type not in by_source:
-                by_source[source_type] = []
-            by_source[source_type].append(dep.name)
+        by_source: Dict[str, int] = {}
+        records = []
+        pinned = 0
+        
+        # Counts and per-dependency records in a single pass
+        for dep in self.dependencies.values():
+            if dep.operator == _PINNED_OPERATOR:
+                pinned += 1
+            by_source[dep.source_type] = by_source.get(dep.source_type, 0) + 1
+            records.append({
+                'name': dep.name,
+                'version_spec': dep.version_spec,
+                'source': dep.source_file,
+                'source_type': dep.source_type,
+                'line': dep.line_number
+            })
         
         return {
-            'total_dependencies': len(all_deps),
-            'pinned_dependencies': len(pinned),
-            'unpinned_dependencies': len(unpinned),
-            'by_source_type': {k: len(v) for k, v in by_source.items()},
-            'dependencies': [
-                {
-                    'name': dep.name,
-                    'version_spec': dep.version_spec,
-                    'source': dep.source_file,
-                    'source_type': dep.source_type,
-                    'line': dep.line_number
-                }
-                for dep in all_deps
-            ]
+            'total_dependencies': len(records),
+            'pinned_dependencies': pinned,
+            'unpinned_dependencies': len(records) - pinned,
+            'by_source_type': by_source,
+            'dependencies': records
         }
 
-
 def main():
     """Test the enhanced DependencyParser."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("=" * 70)
     print("Testing Enhanced DependencyParser")
     print("=" * 70)
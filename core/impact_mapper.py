@@ -7,10 +7,14 @@ Combines data from:
 - Code scanner (code usage locations)
 """
 
+import logging
+from collections import defaultdict
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from pathlib import Path
 
+log = logging.getLogger("depintel")
+
 
 @dataclass
 class ImpactedCode:
@@ -84,7 +88,7 @@ class ImpactMapper:
         Returns:
             Dictionary mapping package names to BreakingChangeImpact objects
         """
-        print("[INFO] Mapping breaking changes to impacted code...")
+        log.info("[INFO] Mapping breaking changes to impacted code...")
         self.impact_reports = {}
         
         for update in breaking_updates:
@@ -94,7 +98,7 @@ class ImpactMapper:
             usage_report = usage_reports.get(package_name)
             
             if not usage_report:
-                print(f"  [WARNING] No code usage found for {package_name}")
+                log.warning("  [WARNING] No code usage found for %s", package_name)
                 continue
             
             # Create impact report
@@ -124,9 +128,9 @@ class ImpactMapper:
             
             self.impact_reports[package_name] = impact
             
-            print(f"  [BREAKING] {package_name}: {impact.total_impacts} impacts in {impact.files_affected} files")
+            log.info("  [BREAKING] %s: %s impacts in %s files", package_name, impact.total_impacts, impact.files_affected)
         
-        print(f"[OK] Mapped {len(self.impact_reports)} breaking changes")
+        log.info("[OK] Mapped %s breaking changes", len(self.impact_reports))
         return self.impact_reports
     
     def get_impact_report(self, package_name: str) -> Optional[BreakingChangeImpact]:
@@ -215,10 +219,8 @@ class ImpactMapper:
             lines.append("")
             
             # Group by file
-            by_file = {}
+            by_file = defaultdict(list)
             for code in impact.impacted_code:
-                if code.file_path not in by_file:
-                    by_file[code.file_path] = []
                 by_file[code.file_path].append(code)
             
             for file_path, codes in sorted(by_file.items()):
@@ -236,6 +238,8 @@ def main():
     """
     Test the ImpactMapper module.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("=" * 60)
     print("Testing ImpactMapper")
     print("=" * 60)
@@ -7,18 +7,24 @@ Implements streaming data processing using Pathway to:
 - Perform streaming joins to detect outdated and breaking changes
 """
 
+import logging
+
+log = logging.getLogger("depintel")
+
 # Pathway is optional for this simplified implementation
 try:
     import pathway as pw
     PATHWAY_AVAILABLE = True
 except ImportError:
     PATHWAY_AVAILABLE = False
-    print("[INFO] Pathway not installed. Using simplified streaming simulation.")
+    log.info("[INFO] Pathway not installed. Using simplified streaming simulation.")
 
 from typing import Dict, List, Optional, Set
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import json
 import requests
-import time
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from packaging import version as pkg_version
 
@@ -52,45 +58,80 @@ class PyPIClient:
     BASE_URL = "https://pypi.org/pypi"
     
     @staticmethod
-    def get_package_info(package_name: str) -> Optional[Dict]:
+    def get_package_info(package_name: str, session: Optional[requests.Session] = None,
+                         cache=None) -> Optional[Dict]:
         """
         Fetch package information from PyPI.
         
+        When a cache is given, the request is made conditional on the cached
+        ETag / Last-Modified validators so unchanged packages come back as
+        304 Not Modified and are served from the cache.
+        
         Args:
             package_name: Name of the package
+            session: Optional shared session to reuse pooled connections
+            cache: Optional PyPICache for conditional requests
             
         Returns:
             Package info dict or None if not found
         """
+        cached = cache.get(package_name) if cache else None
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
         try:
             url = f"{PyPIClient.BASE_URL}/{package_name}/json"
-            response = requests.get(url, timeout=10)
+            http = session or requests
+            response = http.get(url, headers=headers, timeout=10)
             
-            if response.status_code == 200:
+            if response.status_code == 304 and cached:
+                return json.loads(cached[2])
+            elif response.status_code == 200:
+                if cache:
+                    cache.put(
+                        package_name,
+                        response.headers.get('ETag'),
+                        response.headers.get('Last-Modified'),
+                        response.text
+                    )
                 return response.json()
             elif response.status_code == 404:
-                print(f"[WARNING] Package '{package_name}' not found on PyPI")
+                log.warning("[WARNING] Package '%s' not found on PyPI", package_name)
                 return None
+            elif cached:
+                log.warning("[WARNING] Failed to fetch %s: HTTP %s (using cached metadata)", package_name, response.status_code)
+                return json.loads(cached[2])
             else:
-                print(f"[WARNING] Failed to fetch {package_name}: HTTP {response.status_code}")
+                log.warning("[WARNING] Failed to fetch %s: HTTP %s", package_name, response.status_code)
                 return None
                 
         except requests.RequestException as e:
-            print(f"[WARNING] Error fetching {package_name}: {e}")
+            if cached:
+                log.warning("[WARNING] Error fetching %s: %s (using cached metadata)", package_name, e)
+                return json.loads(cached[2])
+            log.warning("[WARNING] Error fetching %s: %s", package_name, e)
             return None
     
     @staticmethod
-    def get_latest_version(package_name: str) -> Optional[str]:
+    def get_latest_version(package_name: str, session: Optional[requests.Session] = None,
+                           cache=None) -> Optional[str]:
         """
         Get the latest version of a package from PyPI.
         
         Args:
             package_name: Name of the package
+            session: Optional shared session to reuse pooled connections
+            cache: Optional PyPICache for conditional requests
             
         Returns:
             Latest version string or None if not found
         """
-        info = PyPIClient.get_package_info(package_name)
+        info = PyPIClient.get_package_info(package_name, session, cache)
         if info and 'info' in info:
             return info['info'].get('version')
         return None
@@ -207,8 +248,16 @@ class PathwayStreamEngine:
     with real-time data sources.
     """
     
-    def __init__(self):
-        """Initialize the streaming engine."""
+    MAX_CONCURRENT_REQUESTS = 32
+    
+    def __init__(self, cache=None):
+        """
+        Initialize the streaming engine.
+        
+        Args:
+            cache: Optional PyPICache used to revalidate PyPI metadata
+        """
+        self.cache = cache
         self.repo_dependencies: Dict[str, str] = {}
         self.pypi_cache: Dict[str, str] = {}
         self.updates: List[PackageUpdate] = []
@@ -220,40 +269,59 @@ class PathwayStreamEngine:
         Args:
             dependencies: Dict mapping package names to Dependency objects
         """
-        print("[INFO] Loading repository dependencies...")
-        self.repo_dependencies = {}
+        log.info("[INFO] Loading repository dependencies...")
+        self.repo_dependencies = {
+            name: dep.version for name, dep in dependencies.items() if dep.version
+        }
         
-        for name, dep in dependencies.items():
-            if dep.version:
-                self.repo_dependencies[name] = dep.version
-                print(f"  - {name}: {dep.version}")
-            else:
-                print(f"  - {name}: (no version specified)")
+        # Versioned packages are echoed again when fetched, so only list the rest
+        if len(self.repo_dependencies) < len(dependencies):
+            unversioned = [name for name in dependencies if name not in self.repo_dependencies]
+            log.info("  - No version specified (skipped): %s", ', '.join(unversioned))
         
-        print(f"[OK] Loaded {len(self.repo_dependencies)} dependencies with versions")
+        log.info("[OK] Loaded %s dependencies with versions", len(self.repo_dependencies))
     
-    def fetch_pypi_updates(self) -> None:
+    def fetch_pypi_updates(self, max_workers: int = MAX_CONCURRENT_REQUESTS) -> None:
         """
         Fetch latest versions from PyPI for all dependencies.
         This simulates a streaming data source.
+        
+        Requests are dispatched concurrently over a shared connection pool,
+        so total latency is bounded by the slowest batch rather than the
+        sum of per-package round trips.
+        
+        Args:
+            max_workers: Maximum number of in-flight PyPI requests
         """
-        print("\n[INFO] Fetching latest versions from PyPI...")
+        log.info("\n[INFO] Fetching latest versions from PyPI...")
         self.pypi_cache = {}
         
-        for package_name in self.repo_dependencies.keys():
-            print(f"  - Checking {package_name}...", end=" ")
-            latest = PyPIClient.get_latest_version(package_name)
-            
-            if latest:
-                self.pypi_cache[package_name] = latest
-                print(f"latest: {latest}")
-            else:
-                print("not found")
+        package_names = list(self.repo_dependencies)
+        if not package_names:
+            log.info("[OK] Fetched 0 package versions from PyPI")
+            return
+        
+        # The worker count bounds concurrent requests, which replaces the
+        # fixed per-request sleep previously used to avoid overwhelming PyPI
+        workers = min(max_workers, len(package_names))
+        
+        with requests.Session() as session:
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=workers))
             
-            # Rate limiting to avoid overwhelming PyPI
-            time.sleep(0.5)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    lambda name: PyPIClient.get_latest_version(name, session, self.cache),
+                    package_names
+                )
+                
+                for package_name, latest in zip(package_names, results):
+                    if latest:
+                        self.pypi_cache[package_name] = latest
+                        log.info("  - Checking %s... latest: %s", package_name, latest)
+                    else:
+                        log.info("  - Checking %s... not found", package_name)
         
-        print(f"[OK] Fetched {len(self.pypi_cache)} package versions from PyPI")
+        log.info("[OK] Fetched %s package versions from PyPI", len(self.pypi_cache))
     
     def perform_streaming_join(self) -> List[PackageUpdate]:
         """
@@ -263,7 +331,7 @@ class PathwayStreamEngine:
         Returns:
             List of PackageUpdate objects
         """
-        print("\n[INFO] Performing streaming join: repo_deps × pypi_feed")
+        log.info("\n[INFO] Performing streaming join: repo_deps × pypi_feed")
         self.updates = []
         
         for package_name, current_version in self.repo_dependencies.items():
@@ -290,13 +358,13 @@ class PathwayStreamEngine:
             
             # Log the result
             if status == 'breaking':
-                print(f"  [BREAKING] {package_name}: {current_version} -> {latest_version}")
+                log.info("  [BREAKING] %s: %s -> %s", package_name, current_version, latest_version)
             elif status == 'outdated':
-                print(f"  [OUTDATED] {package_name}: {current_version} -> {latest_version}")
+                log.info("  [OUTDATED] %s: %s -> %s", package_name, current_version, latest_version)
             elif status == 'up-to-date':
-                print(f"  [OK] {package_name}: {current_version} (up-to-date)")
+                log.info("  [OK] %s: %s (up-to-date)", package_name, current_version)
         
-        print(f"\n[OK] Detected {len(self.updates)} package updates")
+        log.info("\n[OK] Detected %s package updates", len(self.updates))
         return self.updates
     
     def get_outdated_packages(self) -> List[PackageUpdate]:
@@ -340,6 +408,8 @@ def main():
     """
     Test the Pathway Streaming Engine.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("=" * 60)
     print("Testing Pathway Streaming Engine")
     print("=" * 60)
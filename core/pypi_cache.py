@@ -0,0 +1,114 @@
+"""
+PyPI Metadata Cache Module
+
+Persists PyPI JSON metadata on disk so repeated analyses can revalidate
+packages with conditional GETs (If-None-Match / If-Modified-Since)
+instead of downloading the full metadata on every run.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+log = logging.getLogger("depintel")
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "depintel" / "pypi.sqlite"
+
+
+class PyPICache:
+    """
+    SQLite-backed cache of PyPI package metadata.
+    
+    Each entry stores the raw JSON body together with the ETag and
+    Last-Modified validators returned by PyPI, keyed by package name.
+    The cache is safe to share between the worker threads used to
+    fetch PyPI updates. If the database cannot be opened (e.g. the home
+    directory is missing or read-only), the cache stays empty and every
+    lookup misses.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the cache, creating the database if needed.
+        
+        Args:
+            path: Path to the SQLite database (default: ~/.cache/depintel/pypi.sqlite)
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS packages (
+                    name TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT NOT NULL
+                )
+                """
+            )
+            # Left behind by versions that stored streaming-join results here
+            conn.execute("DROP TABLE IF EXISTS join_state")
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            log.warning("[WARNING] PyPI metadata cache unavailable, continuing without it: %s", e)
+    
+    def get(self, package_name: str) -> Optional[Tuple[Optional[str], Optional[str], str]]:
+        """
+        Look up cached metadata for a package.
+        
+        Args:
+            package_name: Name of the package
+        
+        Returns:
+            Tuple of (etag, last_modified, body) or None if not cached
+        """
+        with self._lock:
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body FROM packages WHERE name = ?",
+                (package_name,)
+            ).fetchone()
+        return row
+    
+    def put(self, package_name: str, etag: Optional[str], last_modified: Optional[str], body: str) -> None:
+        """
+        Store (or replace) metadata for a package.
+        
+        Args:
+            package_name: Name of the package
+            etag: ETag header returned by PyPI
+            last_modified: Last-Modified header returned by PyPI
+            body: Raw JSON response body
+        """
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO packages (name, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+                (package_name, etag, last_modified, body)
+            )
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute("DELETE FROM packages")
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the underlying database connection (safe to call twice)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -5,6 +5,7 @@ Handles cloning GitHub repositories and validating local repositories.
 Implements smart caching to avoid re-cloning existing repositories.
 """
 
+import logging
 import os
 import subprocess
 import shutil
@@ -12,6 +13,8 @@ from pathlib import Path
 from typing import Optional, Tuple
 from urllib.parse import urlparse
 
+log = logging.getLogger("depintel")
+
 
 class RepoFetcher:
     """
@@ -102,18 +105,18 @@ class RepoFetcher:
         
         # Check if already cloned
         if cached_repo_path.exists():
-            print(f"[OK] Repository already cached at: {cached_repo_path}")
+            log.info("[OK] Repository already cached at: %s", cached_repo_path)
             # Validate the cached repo
             is_valid, path, error = self._validate_local_repo(str(cached_repo_path))
             if is_valid:
                 return True, path, None
             else:
                 # Cached repo is invalid, remove and re-clone
-                print(f"[WARNING] Cached repository is invalid, removing and re-cloning...")
+                log.warning("[WARNING] Cached repository is invalid, removing and re-cloning...")
                 shutil.rmtree(cached_repo_path)
         
         # Clone the repository
-        print(f"[CLONE] Cloning repository: {github_url}")
+        log.info("[CLONE] Cloning repository: %s", github_url)
         try:
             result = subprocess.run(
                 ["git", "clone", github_url, str(cached_repo_path)],
@@ -125,7 +128,7 @@ class RepoFetcher:
             if result.returncode != 0:
                 return False, None, f"Git clone failed: {result.stderr}"
             
-            print(f"[OK] Successfully cloned to: {cached_repo_path}")
+            log.info("[OK] Successfully cloned to: %s", cached_repo_path)
             return True, cached_repo_path, None
             
         except subprocess.TimeoutExpired:
@@ -204,13 +207,15 @@ class RepoFetcher:
         if self.cache_dir.exists():
             shutil.rmtree(self.cache_dir)
             self.cache_dir.mkdir(parents=True, exist_ok=True)
-            print(f"[OK] Cleaned cache directory: {self.cache_dir}")
+            log.info("[OK] Cleaned cache directory: %s", self.cache_dir)
 
 
 def main():
     """
     Test the RepoFetcher module.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     fetcher = RepoFetcher()
     
     # Test with a sample GitHub repo
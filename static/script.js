@@ -81,8 +81,17 @@ function displayResults(data) {
     // Update repository path
     repoPathEl.textContent = data.repository || 'Unknown';
 
+    // Up-to-date packages arrive as a compact name -> version map
+    const upToDatePackages = Object.entries(data.up_to_date || {}).map(([name, version]) => ({
+        package: name,
+        current_version: version,
+        latest_version: version,
+        status: 'up-to-date',
+        impacted_files: []
+    }));
+
     // Display packages
-    displayPackages(data.results || []);
+    displayPackages((data.results || []).concat(upToDatePackages));
 
     // Scroll to results
     resultsSection.scrollIntoView({ behavior: 'smooth', block: 'start' });
@@ -8,12 +8,17 @@ from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 import os
 import sys
+import logging
 import threading
 import json
 from pathlib import Path
 
 # Import the main system
 from app import DeprecationIntelligenceSystem
+from core.pypi_cache import PyPICache
+
+# Show analysis progress in the server log
+logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='static', static_url_path='')
@@ -22,6 +27,10 @@ CORS(app)
 # Store analysis results temporarily
 analysis_cache = {}
 
+# One PyPI metadata cache (a single SQLite connection) shared by every
+# request, instead of a connection opened per analysis and never closed
+pypi_cache = PyPICache()
+
 
 @app.route('/')
 def index():
@@ -57,7 +66,7 @@ def analyze_repository():
             }), 400
         
         # Initialize the system
-        system = DeprecationIntelligenceSystem()
+        system = DeprecationIntelligenceSystem(pypi_cache=pypi_cache)
         
         # Run analysis
         report = system.run(repo_url)